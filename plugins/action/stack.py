@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+from ..plugin_utils.action import ControllerAction as ActionModule
+
+__all__ = ['ActionModule']
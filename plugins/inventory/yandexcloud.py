@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+DOCUMENTATION = '''
+name: yandexcloud
+short_description: Yandex Cloud network load balancer targets and functions
+description:
+  - Builds hosts from the targets of network load balancers and from serverless functions.
+  - Targets are grouped by load balancer listener and by load balancer labels, functions by their labels.
+  - Folders are listed concurrently.
+  - The configuration file name must end with C(yandexcloud.yml) or C(yandexcloud.yaml).
+extends_documentation_fragment:
+  - inventory_cache
+  - constructed
+options:
+  plugin:
+    description: The name of this plugin.
+    required: true
+    choices: ['q0w.yandexcloud.yandexcloud']
+  auth_kind:
+    description: The type of credential used.
+    required: true
+    choices: ['oauth', 'sa_file']
+  oauth_token:
+    description: OAuth token, used when O(auth_kind=oauth).
+  sa_path:
+    description: Path to a service account key file, used when O(auth_kind=sa_file).
+  sa_content:
+    description: Service account key json, used when O(auth_kind=sa_file).
+  endpoint:
+    description: Yandex Cloud API endpoint.
+  folder_ids:
+    description: Folders to build the inventory from.
+    type: list
+    elements: str
+    required: true
+  targets:
+    description: Add network load balancer targets.
+    type: bool
+    default: true
+  functions:
+    description: Add functions.
+    type: bool
+    default: true
+  max_workers:
+    description: Number of concurrent API calls.
+    type: int
+    default: 10
+'''
+
+EXAMPLES = '''
+plugin: q0w.yandexcloud.yandexcloud
+auth_kind: sa_file
+sa_path: /etc/yc/key.json
+folder_ids:
+  - b1g0000000000000000
+  - b1g1111111111111111
+cache: true
+cache_timeout: 600
+'''
+
+import re
+from contextlib import suppress
+from typing import Any
+
+from ansible.errors import AnsibleError
+from ansible.plugins.inventory import BaseInventoryPlugin
+from ansible.plugins.inventory import Cacheable
+from ansible.plugins.inventory import Constructable
+
+from ..module_utils.basic import create_sdk
+from ..module_utils.basic import HAS_YANDEX
+from ..module_utils.basic import load_auth_settings
+from ..module_utils.basic import paginate
+from ..module_utils.basic import run_concurrently
+from ..module_utils.diff import to_dict
+
+with suppress(ImportError):
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import GetTargetStatesRequest
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import ListNetworkLoadBalancersRequest
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2_grpc import NetworkLoadBalancerServiceStub
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
+
+
+def group_name(*parts: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_]', '_', '_'.join(parts))
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = 'q0w.yandexcloud.yandexcloud'
+
+    def verify_file(self, path: str) -> bool:
+        return super().verify_file(path) and path.endswith(('yandexcloud.yml', 'yandexcloud.yaml'))
+
+    def parse(self, inventory: Any, loader: Any, path: str, cache: bool = True) -> None:
+        super().parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+        if not HAS_YANDEX:
+            raise AnsibleError('the yandexcloud python library is required for this inventory plugin')
+
+        cache_key = self.get_cache_key(path)
+        use_cache = self.get_option('cache') and cache
+        data = None
+        if use_cache:
+            try:
+                data = self._cache[cache_key]
+            except KeyError:
+                pass
+        if data is None:
+            data = self._fetch()
+            if self.get_option('cache'):
+                self._cache[cache_key] = data
+        self._populate(data)
+
+    def _fetch(self) -> dict[str, Any]:
+        # everything is listed up front in two concurrent rounds: folders, then target states of each balancer
+        try:
+            auth_settings = load_auth_settings(
+                {k: self.get_option(k) for k in ('auth_kind', 'oauth_token', 'sa_path', 'sa_content')},
+            )
+            sdk = create_sdk(auth_settings, self.get_option('endpoint'))
+        except (ValueError, OSError) as e:
+            raise AnsibleError(f'failed to load credentials: {e}') from e
+        nlb_client = sdk.client(NetworkLoadBalancerServiceStub)
+        function_client = sdk.client(FunctionServiceStub)
+        max_workers = self.get_option('max_workers')
+
+        calls = {}
+        for folder_id in self.get_option('folder_ids'):
+            if self.get_option('targets'):
+                calls[f'nlb/{folder_id}'] = lambda folder_id=folder_id: [
+                    to_dict(nlb)
+                    for nlb in paginate(
+                        nlb_client.List,
+                        ListNetworkLoadBalancersRequest(folder_id=folder_id),
+                        'network_load_balancers',
+                        page_size=1000,
+                    )
+                ]
+            if self.get_option('functions'):
+                calls[f'function/{folder_id}'] = lambda folder_id=folder_id: [
+                    to_dict(f)
+                    for f in paginate(
+                        function_client.List,
+                        ListFunctionsRequest(folder_id=folder_id),
+                        'functions',
+                        page_size=1000,
+                    )
+                ]
+        listed, errors = run_concurrently(calls, max_workers)
+        self._raise_errors(errors)
+
+        nlbs = [nlb for key, items in listed.items() if key.startswith('nlb/') for nlb in items]
+        functions = [f for key, items in listed.items() if key.startswith('function/') for f in items]
+
+        calls = {}
+        for nlb in nlbs:
+            for group in nlb.get('attached_target_groups', []):
+                calls[f'{nlb["id"]}/{group["target_group_id"]}'] = (
+                    lambda nlb_id=nlb['id'], tg_id=group['target_group_id']: [
+                        to_dict(state)
+                        for state in nlb_client.GetTargetStates(
+                            GetTargetStatesRequest(network_load_balancer_id=nlb_id, target_group_id=tg_id),
+                        ).target_states
+                    ]
+                )
+        target_states, errors = run_concurrently(calls, max_workers)
+        self._raise_errors(errors)
+
+        for nlb in nlbs:
+            nlb['targets'] = [
+                state
+                for group in nlb.get('attached_target_groups', [])
+                for state in target_states[f'{nlb["id"]}/{group["target_group_id"]}']
+            ]
+        return {'network_load_balancers': nlbs, 'functions': functions}
+
+    def _raise_errors(self, errors: dict[str, str]) -> None:
+        if errors:
+            raise AnsibleError('; '.join(f'{key}: {error}' for key, error in errors.items()))
+
+    def _populate(self, data: dict[str, Any]) -> None:
+        strict = self.get_option('strict')
+
+        # names are optional, MessageToDict leaves them out of unnamed resources
+        for nlb in data['network_load_balancers']:
+            nlb_name = nlb.get('name') or nlb['id']
+            listener_groups = [group_name('nlb', nlb_name, listener['name']) for listener in nlb.get('listeners', [])]
+            label_groups = [group_name('label', k, v) for k, v in nlb.get('labels', {}).items()]
+            for group in [*listener_groups, *label_groups]:
+                self.inventory.add_group(group)
+            for target in nlb['targets']:
+                host = target['address']
+                self.inventory.add_host(host)
+                for group in [*listener_groups, *label_groups]:
+                    self.inventory.add_child(group, host)
+                hostvars = {
+                    'ansible_host': target['address'],
+                    'yandexcloud_subnet_id': target.get('subnet_id'),
+                    'yandexcloud_target_status': target.get('status'),
+                    'yandexcloud_network_load_balancer_id': nlb['id'],
+                }
+                for k, v in hostvars.items():
+                    self.inventory.set_variable(host, k, v)
+                self._set_composite_vars(self.get_option('compose'), hostvars, host, strict=strict)
+                self._add_host_to_composed_groups(self.get_option('groups'), hostvars, host, strict=strict)
+                self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, host, strict=strict)
+
+        if data['functions']:
+            self.inventory.add_group('functions')
+        for function in data['functions']:
+            host = function.get('name') or function['id']
+            self.inventory.add_host(host, group='functions')
+            hostvars = {
+                'ansible_connection': 'local',
+                'yandexcloud_function_id': function['id'],
+                'yandexcloud_folder_id': function['folder_id'],
+                'yandexcloud_http_invoke_url': function.get('http_invoke_url'),
+                'yandexcloud_labels': function.get('labels', {}),
+            }
+            for k, v in hostvars.items():
+                self.inventory.set_variable(host, k, v)
+            for k, v in function.get('labels', {}).items():
+                self.inventory.add_group(group_name('label', k, v))
+                self.inventory.add_child(group_name('label', k, v), host)
+            self._set_composite_vars(self.get_option('compose'), hostvars, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), hostvars, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, host, strict=strict)
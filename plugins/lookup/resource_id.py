@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+DOCUMENTATION = '''
+name: resource_id
+short_description: Resolve function, api gateway and network load balancer names to ids
+description:
+  - Returns the ids of the named resources, in the order of the terms.
+  - Names are grouped by kind and folder and each group is resolved with a single C(List) call.
+  - Resolved ids are memoized by kind, folder and name for the rest of the play.
+options:
+  _terms:
+    description:
+      - Resource names.
+      - A term can also be a dictionary with C(name) and optional C(kind) and C(folder_id) overriding the options.
+    required: true
+  kind:
+    description: The kind of the resources.
+    choices: ['function', 'api_gateway', 'nlb']
+    default: function
+  folder_id:
+    description: The folder the resources are in.
+  auth_kind:
+    description: The type of credential used.
+    required: true
+    choices: ['oauth', 'sa_file']
+  oauth_token:
+    description: OAuth token, used when O(auth_kind=oauth).
+  sa_path:
+    description: Path to a service account key file, used when O(auth_kind=sa_file).
+  sa_content:
+    description: Service account key json, used when O(auth_kind=sa_file).
+  endpoint:
+    description: Yandex Cloud API endpoint.
+  cache_dir:
+    description: Directory of the name cache.
+    default: ~/.cache/yandexcloud
+  name_cache:
+    description:
+      - Share resolved ids through the on-disk name cache.
+      - Lookups run in forked workers, so without it ids are only memoized within a task.
+    type: bool
+    default: true
+  name_cache_ttl:
+    description: Seconds a resolved id is kept in the name cache.
+    type: int
+    default: 300
+'''
+
+EXAMPLES = '''
+- name: Ids of two functions
+  ansible.builtin.debug:
+    msg: >-
+      {{ query('q0w.yandexcloud.resource_id', 'api', 'worker',
+               folder_id=folder_id, auth_kind='sa_file', sa_path=key) }}
+
+- name: Names from several folders, one List per folder
+  ansible.builtin.set_fact:
+    ids: "{{ query('q0w.yandexcloud.resource_id', *targets, auth_kind='oauth', oauth_token=token) }}"
+  vars:
+    targets:
+      - {name: api, folder_id: b1g0000000000000000}
+      - {name: front, kind: api_gateway, folder_id: b1g1111111111111111}
+'''
+
+RETURN = '''
+_raw:
+  description: Resource ids, one per term.
+  type: list
+  elements: str
+'''
+
+from collections import defaultdict
+from contextlib import suppress
+from typing import Any
+from typing import Callable
+from typing import Mapping
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+
+from ..module_utils.basic import create_sdk
+from ..module_utils.basic import HAS_YANDEX
+from ..module_utils.basic import load_auth_settings
+from ..module_utils.cache import NameCache
+
+with suppress(ImportError):
+    import grpc
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2_grpc import NetworkLoadBalancerServiceStub
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2_grpc import ApiGatewayServiceStub
+    from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
+
+    from ..module_utils.api_gateway import get_api_gateway_ids
+    from ..module_utils.function import get_function_ids
+    from ..module_utils.nlb import get_nlb_ids
+
+# (kind, folder_id, name) -> id, for every lookup in this process
+_IDS: dict[tuple[str, str, str], str] = {}
+
+
+def list_ids(kind: str) -> tuple[Any, Callable[..., dict[str, str]]]:
+    return {
+        'function': (FunctionServiceStub, get_function_ids),
+        'api_gateway': (ApiGatewayServiceStub, get_api_gateway_ids),
+        'nlb': (NetworkLoadBalancerServiceStub, get_nlb_ids),
+    }[kind]
+
+
+class LookupModule(LookupBase):
+    def run(self, terms: list[Any], variables: dict[str, Any] | None = None, **kwargs: Any) -> list[str]:
+        if not HAS_YANDEX:
+            raise AnsibleError('the yandexcloud python library is required for this lookup plugin')
+        self.set_options(var_options=variables, direct=kwargs)
+
+        keys = [self._key(term) for term in terms]
+        cache = None
+        if self.get_option('name_cache'):
+            cache = NameCache(self.get_option('cache_dir'), self.get_option('name_cache_ttl'))
+
+        missing = defaultdict(set)
+        for kind, folder_id, name in keys:
+            if (kind, folder_id, name) in _IDS:
+                continue
+            cached = cache and cache.get(kind, folder_id, name)
+            if cached:
+                _IDS[kind, folder_id, name] = cached
+            else:
+                missing[kind, folder_id].add(name)
+
+        if missing:
+            sdk = self._sdk()
+            for (kind, folder_id), names in missing.items():
+                stub, get_ids = list_ids(kind)
+                try:
+                    ids = get_ids(sdk.client(stub), folder_id, cache)
+                except grpc.RpcError as e:
+                    raise AnsibleError(f'failed to list {kind} in {folder_id}: {e.details()}') from e
+                _IDS.update({(kind, folder_id, n): id for n, id in ids.items()})
+                not_found = sorted(names - ids.keys())
+                if not_found:
+                    raise AnsibleError(f'{kind} {", ".join(not_found)} not found in {folder_id}')
+
+        return [_IDS[key] for key in keys]
+
+    def _key(self, term: Any) -> tuple[str, str, str]:
+        if isinstance(term, Mapping):
+            kind, folder_id, name = term.get('kind'), term.get('folder_id'), term.get('name')
+        else:
+            kind, folder_id, name = None, None, term
+        kind = kind or self.get_option('kind')
+        folder_id = folder_id or self.get_option('folder_id')
+        if kind not in ('function', 'api_gateway', 'nlb'):
+            raise AnsibleError(f'unsupported kind {kind}')
+        if not folder_id or not name:
+            raise AnsibleError(f'both folder_id and name are required, got {term}')
+        return kind, folder_id, name
+
+    def _sdk(self) -> Any:
+        try:
+            auth_settings = load_auth_settings(
+                {k: self.get_option(k) for k in ('auth_kind', 'oauth_token', 'sa_path', 'sa_content')},
+            )
+        except (ValueError, OSError) as e:
+            raise AnsibleError(f'failed to load credentials: {e}') from e
+        return create_sdk(auth_settings, self.get_option('endpoint'))
@@ -4,11 +4,50 @@ from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import ListApi
 from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2_grpc import ApiGatewayServiceStub
 
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import paginate
+from ..module_utils.basic import resolve_id
+from ..module_utils.cache import NameCache
 
 
-def get_api_gateway_id(client: ApiGatewayServiceStub, folder_id: str, name: str) -> str:
+def get_api_gateway_id(
+    client: ApiGatewayServiceStub,
+    folder_id: str,
+    name: str,
+    cache: NameCache | None = None,
+) -> str:
+    return resolve_id(
+        cache,
+        'api_gateway',
+        folder_id,
+        name,
+        lambda: _find_api_gateway_id(client, folder_id, name),
+        lambda: get_api_gateway_ids(client, folder_id),
+    )
+
+
+def _find_api_gateway_id(client: ApiGatewayServiceStub, folder_id: str, name: str) -> str:
     # get the latest api_gateway
-    ags = client.List(ListApiGatewayRequest(folder_id=folder_id, filter=f'name="{name}"')).api_gateways
-    if not ags:
+    ag = next(
+        paginate(
+            client.List,
+            ListApiGatewayRequest(folder_id=folder_id, filter=f'name="{name}"'),
+            'api_gateways',
+            limit=1,
+        ),
+        None,
+    )
+    if ag is None:
         raise NotFound(f'function {name} not found')
-    return ags[0].id
+    return ag.id
+
+
+def get_api_gateway_ids(
+    client: ApiGatewayServiceStub,
+    folder_id: str,
+    cache: NameCache | None = None,
+) -> dict[str, str]:
+    items = paginate(client.List, ListApiGatewayRequest(folder_id=folder_id), 'api_gateways', page_size=1000)
+    ids = {i.name: i.id for i in items}
+    if cache is not None:
+        cache.put('api_gateway', folder_id, ids)
+    return ids
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import contextlib
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from typing import BinaryIO
+from typing import Generator
+
+
+class MappedFile(mmap.mmap):
+    # zipfile requires seekable() which mmap lacks before python 3.13
+    def seekable(self) -> bool:
+        return True
+
+
+@contextlib.contextmanager
+def map_file(filename: str) -> Generator[MappedFile, None, None]:
+    with open(filename, 'rb') as f, MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        yield m
+
+
+# signature, version, flags, method, mtime, mdate, crc32, compressed size, size, name length, extra length
+ZIP_LOCAL_HEADER = struct.Struct('<4s5H3I2H')
+ZIP_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+def validate_zip(archive: BinaryIO | MappedFile, crc: bool = False) -> None:
+    # the central directory and local headers are enough to check the structure,
+    # members are decompressed only to check their crc. Every problem is raised as BadZipFile
+    try:
+        _validate_zip(archive, crc)
+    except (EOFError, NotImplementedError, RuntimeError, ValueError, zlib.error) as e:
+        # mmap refuses to seek out of range where a file would read short, zipfile lets both through
+        raise zipfile.BadZipFile(f'archive is not valid zip file: {e}') from e
+
+
+def _validate_zip(archive: BinaryIO | MappedFile, crc: bool) -> None:
+    archive.seek(0, os.SEEK_END)
+    size = archive.tell()
+    with zipfile.ZipFile(archive) as f:
+        for info in f.infolist():
+            if not 0 <= info.header_offset <= size - ZIP_LOCAL_HEADER.size:
+                raise zipfile.BadZipFile(f'{info.filename}: truncated local header')
+            archive.seek(info.header_offset)
+            signature, *_, name_length, extra_length = ZIP_LOCAL_HEADER.unpack(archive.read(ZIP_LOCAL_HEADER.size))
+            data_end = info.header_offset + ZIP_LOCAL_HEADER.size + name_length + extra_length + info.compress_size
+            if signature != ZIP_LOCAL_HEADER_SIGNATURE or data_end > size:
+                raise zipfile.BadZipFile(f'{info.filename}: bad local header')
+        if crc:
+            bad = f.testzip()
+            if bad:
+                raise zipfile.BadZipFile(f'archive is not valid zip file: bad crc of {bad}')
@@ -1,30 +1,53 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import json
+import os
+import time
 import traceback
-import zipfile
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from typing import Any
+from typing import Callable
 from typing import Generator
 from typing import Iterable
 from typing import Mapping
+from typing import NoReturn
 from typing import TYPE_CHECKING
 from typing import TypedDict
+from typing import TypeVar
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 
+from ..module_utils.cache import DEFAULT_CACHE_DIR
+from ..module_utils.cache import NameCache
+from ..module_utils.iam import get_iam_token
+
+# only what every module needs is imported here: the service stubs come with the modules,
+# the helpers for operations, rate limits, timings exports and zip archives are imported when used
 HAS_YANDEX = False
 try:
     import grpc
-    import yandexcloud
+    from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.operation import operation_pb2
+
+    from ..module_utils.retry import backoff
+    from ..module_utils.retry import RetryInterceptor
+    from ..module_utils.sdk import SDK
+    from ..module_utils.timing import TimingInterceptor
 except ImportError:
     YANDEX_ERR = traceback.format_exc()
 else:
     HAS_YANDEX = True
 
 if TYPE_CHECKING:
+    from google.protobuf.message import Message
     from typing_extensions import NotRequired, Required, Unpack
+    from yandex.cloud.operation.operation_pb2 import Operation
 
     class ModuleParams(TypedDict, total=False):
         argument_spec: Required[Mapping[str, Any]]
@@ -38,34 +61,38 @@ if TYPE_CHECKING:
         required_if: NotRequired[list[tuple[str, str, tuple[str, ...], bool]]]
         required_by: NotRequired[Mapping[str, Iterable[str]]]
 
+T = TypeVar('T')
 
-def _get_auth_settings(
-    module: AnsibleModule,
-) -> dict[str, Any]:
+
+def load_auth_settings(params: Mapping[str, Any]) -> dict[str, Any]:
     config = {}
-    if module.params.get('auth_kind') == 'oauth':
-        token = module.params.get('oauth_token')
+    if params.get('auth_kind') == 'oauth':
+        token = params.get('oauth_token')
         if not token:
-            module.fail_json('oauth_token should be set')
+            raise ValueError('oauth_token should be set')
         config['token'] = token
 
-    if module.params.get('auth_kind') == 'sa_file':
-        sa_path = module.params.get('sa_path')
-        sa_content = module.params.get('sa_content')
+    if params.get('auth_kind') == 'sa_file':
+        sa_path = params.get('sa_path')
+        sa_content = params.get('sa_content')
         if sa_path:
-            with log_error(module), open(sa_path) as f:
+            with open(sa_path) as f:
                 config['service_account_key'] = json.load(f)
         elif sa_content:
-            with log_error(module):
-                config['service_account_key'] = json.loads(sa_content)
+            config['service_account_key'] = json.loads(sa_content)
         else:
-            module.fail_json(
-                "Either 'sa_path' or 'sa_content' must be set" " when 'auth_kind' is set to 'sa_file'",
-            )
+            raise ValueError("Either 'sa_path' or 'sa_content' must be set when 'auth_kind' is set to 'sa_file'")
 
     return config
 
 
+def _get_auth_settings(
+    module: AnsibleModule,
+) -> dict[str, Any]:
+    with log_error(module, ValueError, OSError):
+        return load_auth_settings(module.params)
+
+
 def default_arg_spec() -> dict[str, dict[str, Any]]:
     return {
         'auth_kind': {
@@ -76,6 +103,46 @@ def default_arg_spec() -> dict[str, dict[str, Any]]:
         'oauth_token': {'type': 'str'},
         'sa_path': {'type': 'str'},
         'sa_content': {'type': 'str'},
+        'endpoint': {'type': 'str'},
+        'iam_token_cache': {'type': 'bool', 'default': False},
+        'cache_dir': {'type': 'path', 'default': DEFAULT_CACHE_DIR},
+        'name_cache': {'type': 'bool', 'default': False},
+        'name_cache_ttl': {'type': 'int', 'default': 300},
+        'name_cache_prefetch': {'type': 'bool', 'default': False},
+        'retry_max_count': {'type': 'int', 'default': 5},
+        'retry_codes': {
+            'type': 'list',
+            'elements': 'str',
+            'default': ['UNAVAILABLE', 'RESOURCE_EXHAUSTED'],
+            'choices': [
+                'ABORTED',
+                'CANCELLED',
+                'DEADLINE_EXCEEDED',
+                'INTERNAL',
+                'RESOURCE_EXHAUSTED',
+                'UNAVAILABLE',
+                'UNKNOWN',
+            ],
+        },
+        'retry_deadline': {'type': 'float'},
+        'retry_attempt_timeout': {'type': 'float'},
+        'retry_backoff_initial': {'type': 'float', 'default': 0.5},
+        'retry_backoff_max': {'type': 'float', 'default': 10.0},
+        'retry_backoff_multiplier': {'type': 'float', 'default': 2.0},
+        'rate_limits': {'type': 'dict'},
+        'rate_limit_burst': {'type': 'int'},
+        'timings': {'type': 'bool', 'default': False},
+        'timings_file': {'type': 'path'},
+        'timings_format': {'type': 'str', 'default': 'jsonl', 'choices': ['jsonl', 'openmetrics']},
+    }
+
+
+def wait_arg_spec() -> dict[str, dict[str, Any]]:
+    return {
+        'wait': {'type': 'bool', 'default': False},
+        'wait_timeout': {'type': 'int', 'default': 300},
+        'wait_delay': {'type': 'float', 'default': 1.0},
+        'wait_max_delay': {'type': 'float', 'default': 15.0},
     }
 
 
@@ -83,18 +150,203 @@ def default_required_if() -> list[tuple[str, str, tuple[str, ...], bool]]:
     return [('auth_kind', 'sa_file', ('sa_path', 'sa_content'), True)]
 
 
-def init_sdk(module: AnsibleModule) -> yandexcloud.SDK:
-    return yandexcloud.SDK(
-        interceptor=yandexcloud.RetryInterceptor(
-            max_retry_count=5,
-            retriable_codes=[grpc.StatusCode.UNAVAILABLE],
-        ),
-        **_get_auth_settings(module),
+# sdk instances own their channels, modules running in one process (see plugin_utils/action.py)
+# share them; pid keeps forks off the parent's channels
+_SDK_POOL: dict[tuple[int, str], SDK] = {}
+
+
+def init_sdk(module: AnsibleModule) -> SDK:
+    auth_settings = _get_auth_settings(module)
+    if module.params.get('iam_token_cache'):
+        with log_grpc_error(module), log_error(module, OSError):
+            auth_settings = {'iam_token': get_iam_token(module.params['cache_dir'], auth_settings)}
+
+    sdk = create_sdk(
+        auth_settings,
+        module.params.get('endpoint'),
+        retry_settings(module),
+        rate_limit_settings(module),
     )
+    return CheckModeSDK(sdk) if module.check_mode else sdk
+
+
+def retry_settings(module: AnsibleModule) -> dict[str, Any]:
+    return {
+        'max_retry_count': module.params['retry_max_count'],
+        'retriable_codes': module.params['retry_codes'],
+        'deadline': module.params['retry_deadline'],
+        'attempt_timeout': module.params['retry_attempt_timeout'],
+        'backoff_initial': module.params['retry_backoff_initial'],
+        'backoff_max': module.params['retry_backoff_max'],
+        'backoff_multiplier': module.params['retry_backoff_multiplier'],
+    }
+
+
+def rate_limit_settings(module: AnsibleModule) -> dict[str, Any] | None:
+    rates = module.params.get('rate_limits')
+    if not rates:
+        return None
+    from ..module_utils.ratelimit import SERVICES
+
+    with log_error(module, ValueError):
+        unknown = sorted(set(rates) - set(SERVICES))
+        if unknown:
+            raise ValueError(f'unknown services in rate_limits: {", ".join(unknown)}, expected {", ".join(SERVICES)}')
+        rates = {service: float(rate) for service, rate in rates.items()}
+        if any(rate <= 0 for rate in rates.values()):
+            raise ValueError('rate_limits must be positive')
+        burst = module.params['rate_limit_burst']
+        if burst is not None and burst < 1:
+            raise ValueError('rate_limit_burst must be at least 1')
+    return {'directory': module.params['cache_dir'], 'rates': rates, 'burst': burst}
+
+
+def create_sdk(
+    auth_settings: dict[str, Any],
+    endpoint: str | None = None,
+    retry: dict[str, Any] | None = None,
+    rate_limit: dict[str, Any] | None = None,
+) -> SDK:
+    retry = retry or {}
+    key = (
+        os.getpid(),
+        hashlib.sha256(json.dumps([endpoint, auth_settings, retry, rate_limit], sort_keys=True).encode()).hexdigest(),
+    )
+    if key not in _SDK_POOL:
+        # timing sees the whole call, the rate limiter each attempt the retry interceptor makes
+        interceptor = RetryInterceptor(**retry)
+        if rate_limit:
+            from ..module_utils.ratelimit import RateLimitInterceptor
+            from ..module_utils.ratelimit import TokenBucket
+
+            interceptor = RateLimitInterceptor(interceptor, TokenBucket(**rate_limit))
+        interceptor = TimingInterceptor(interceptor, RPC_TIMINGS)
+        if endpoint:
+            # a custom api endpoint needs the discovery of yandexcloud.SDK, which imports the stubs of every service
+            import yandexcloud
+
+            _SDK_POOL[key] = yandexcloud.SDK(interceptor=interceptor, endpoint=endpoint, **auth_settings)
+        else:
+            _SDK_POOL[key] = SDK(interceptor, auth_settings)
+    return _SDK_POOL[key]
+
+
+# mutating calls skipped in check mode, cleared when a module starts
+PLANNED_CALLS: list[dict[str, Any]] = []
+READ_METHOD_PREFIXES = ('Get', 'List')
+
+
+def planned_request(request: Message) -> dict[str, Any]:
+    # archives and other payloads are reported by their size
+    planned = MessageToDict(request, preserving_proto_field_name=True)
+    for field, value in request.ListFields():
+        if field.type == field.TYPE_BYTES:
+            planned[field.name] = f'<{len(value)} bytes>'
+    return planned
+
+
+class CheckModeClient:
+    # reads go to the stub, every other method returns a finished operation and records the call,
+    # so modules follow the same code path in check mode and plan the changes from the real state
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def __getattr__(self, method: str) -> Any:
+        if method.startswith(READ_METHOD_PREFIXES):
+            return getattr(self._client, method)
+
+        def plan(request: Message, **kwargs: Any) -> operation_pb2.Operation:
+            PLANNED_CALLS.append({'method': method, 'request': planned_request(request)})
+            return operation_pb2.Operation(description=f'{method} skipped in check mode', done=True)
+
+        return plan
+
+
+class CheckModeSDK:
+    def __init__(self, sdk: SDK) -> None:
+        self._sdk = sdk
+
+    def client(self, stub: Callable[..., Any]) -> Any:
+        client = self._sdk.client(stub)
+        # operations are only read, polling the planned ones ends at once since they are done
+        return client if stub.__name__ == 'OperationServiceStub' else CheckModeClient(client)
+
+
+_NAME_CACHES: dict[tuple[str, int, bool], NameCache] = {}
+
+
+def name_cache(module: AnsibleModule) -> NameCache | None:
+    if not module.params.get('name_cache'):
+        return None
+    key = (module.params['cache_dir'], module.params['name_cache_ttl'], module.params['name_cache_prefetch'])
+    if key not in _NAME_CACHES:
+        _NAME_CACHES[key] = NameCache(*key)
+    return _NAME_CACHES[key]
+
+
+def resolve_id(
+    cache: NameCache | None,
+    kind: str,
+    folder_id: str,
+    name: str,
+    get_id: Callable[[], str],
+    get_ids: Callable[[], dict[str, str]],
+) -> str:
+    # with prefetch a miss lists the whole folder once, so the following lookups in the play are served from disk
+    if cache is None:
+        return get_id()
+    cached = cache.get(kind, folder_id, name)
+    if cached:
+        return cached
+    if cache.prefetch:
+        ids = get_ids()
+        cache.put(kind, folder_id, ids)
+        if name not in ids:
+            raise NotFound(f'{kind} {name} not found')
+        return ids[name]
+    id = get_id()
+    cache.put(kind, folder_id, {name: id})
+    return id
+
+
+# calls made by every sdk of the process, cleared when a module starts
+RPC_TIMINGS: list[dict[str, Any]] = []
+
+
+class CloudModule(AnsibleModule):
+    # adds the calls made by the run and the calls planned in check mode to its result
+    def exit_json(self, **kwargs: Any) -> NoReturn:
+        self._report_planned(kwargs)
+        self._report_timings(kwargs)
+        super().exit_json(**kwargs)
+
+    def fail_json(self, msg: str, **kwargs: Any) -> NoReturn:
+        self._report_planned(kwargs)
+        self._report_timings(kwargs)
+        super().fail_json(msg, **kwargs)
+
+    def _report_planned(self, result: dict[str, Any]) -> None:
+        if self.check_mode and PLANNED_CALLS:
+            result['planned'] = list(PLANNED_CALLS)
+        PLANNED_CALLS.clear()
+
+    def _report_timings(self, result: dict[str, Any]) -> None:
+        if self.params.get('timings'):
+            result['_timings'] = list(RPC_TIMINGS)
+        if self.params.get('timings_file') and RPC_TIMINGS:
+            from ..module_utils.timing import EXPORTERS
+
+            try:
+                EXPORTERS[self.params['timings_format']](self.params['timings_file'], RPC_TIMINGS)
+            except OSError as e:
+                self.warn(f'failed to export timings: {e}')
+        RPC_TIMINGS.clear()
 
 
 def init_module(**params: Unpack[ModuleParams]) -> AnsibleModule:  # type: ignore[misc]
-    module = AnsibleModule(**params)
+    RPC_TIMINGS.clear()
+    PLANNED_CALLS.clear()
+    module = CloudModule(**params)
     if not HAS_YANDEX:
         module.fail_json(
             msg=missing_required_lib('yandexcloud'),
@@ -108,8 +360,20 @@ def log_grpc_error(module: AnsibleModule) -> Generator[None, None, None]:
     try:
         yield
     except grpc.RpcError as e:
-        (state,) = e.args
-        module.fail_json(msg=state.details)
+        forget_stale_ids(e)
+        module.fail_json(msg=rpc_error_details(e))
+
+
+def forget_stale_ids(e: grpc.RpcError) -> None:
+    if e.code() == grpc.StatusCode.NOT_FOUND:
+        # the id may come from a stale name cache entry, let the next run resolve it again
+        for cache in _NAME_CACHES.values():
+            cache.invalidate_served()
+
+
+def rpc_error_details(e: grpc.RpcError) -> str:
+    (state,) = e.args
+    return state.details
 
 
 @contextlib.contextmanager
@@ -120,11 +384,159 @@ def log_error(module: AnsibleModule, *exceptions) -> Generator[None, None, None]
         module.fail_json(msg=str(e))
 
 
-def validate_zip(module: AnsibleModule, filename: str) -> None:
-    with zipfile.ZipFile(filename, 'r') as f:
-        if f.testzip():
-            module.fail_json(msg=f'{filename} is not valid zip file')
+DEFAULT_PAGE_SIZE = 100
+
+
+def paginate(
+    method: Callable[[Any], Any],
+    request: Message,
+    field: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    limit: int | None = None,
+) -> Generator[Any, None, None]:
+    # follow next_page_token lazily, the next page is requested only when the previous one is consumed
+    if limit is not None and limit < 1:
+        return
+    req = type(request)()
+    req.CopyFrom(request)
+    count = 0
+    while True:
+        req.page_size = page_size if limit is None else min(page_size, limit - count)
+        resp = method(req)
+        for item in getattr(resp, field):
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+        if not resp.next_page_token:
+            return
+        req.page_token = resp.next_page_token
+
+
+def run_concurrently(calls: Mapping[str, Callable[[], T]], max_workers: int) -> tuple[dict[str, T], dict[str, str]]:
+    # grpc channels are thread-safe, so the calls share the sdk channels;
+    # results and errors are keyed and ordered like calls, whatever the completion order is
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls)))) as executor:
+        futures = {key: executor.submit(call) for key, call in calls.items()}
+
+    results: dict[str, T] = {}
+    errors: dict[str, str] = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except grpc.RpcError as e:
+            forget_stale_ids(e)
+            errors[key] = rpc_error_details(e)
+        except (OperationError, NotFound) as e:
+            errors[key] = str(e)
+    return results, errors
+
+
+def run_graph(
+    calls: Mapping[str, tuple[Iterable[str], Callable[[], T]]],
+    max_workers: int,
+) -> tuple[dict[str, T], dict[str, str]]:
+    # calls are keyed like in run_concurrently and come with the keys they depend on,
+    # a call starts as soon as all of its dependencies succeeded and is skipped if one of them failed
+    pending = {key: (set(deps), call) for key, (deps, call) in calls.items()}
+    running: dict[Future[T], str] = {}
+    results: dict[str, T] = {}
+    errors: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls) or 1))) as executor:
+        while pending or running:
+            scheduled = True
+            while scheduled:
+                scheduled = False
+                for key, (deps, call) in list(pending.items()):
+                    failed = sorted(deps & errors.keys())
+                    if failed:
+                        errors[key] = f'skipped since {", ".join(failed)} failed'
+                    elif deps <= results.keys():
+                        running[executor.submit(call)] = key
+                    else:
+                        continue
+                    del pending[key]
+                    scheduled = True
+            if not running:
+                # what is left waits on keys that are unknown or depend on each other
+                for key in pending:
+                    errors[key] = f'unresolved dependencies {", ".join(sorted(pending[key][0] - results.keys()))}'
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    results[key] = future.result()
+                except grpc.RpcError as e:
+                    forget_stale_ids(e)
+                    errors[key] = rpc_error_details(e)
+                except (OperationError, NotFound, ValueError, OSError) as e:
+                    errors[key] = str(e)
+                except Exception as e:
+                    # a bug in one call fails that call and its dependents, not the whole graph
+                    errors[key] = f'{type(e).__name__}: {e}'
+
+    order = list(calls)
+    return (
+        {key: results[key] for key in sorted(results, key=order.index)},
+        {key: errors[key] for key in sorted(errors, key=order.index)},
+    )
+
+
+def poll_operation(
+    sdk: SDK,
+    operation: Operation,
+    timeout: float,
+    delay: float,
+    max_delay: float,
+) -> Operation:
+    from yandex.cloud.operation.operation_service_pb2 import GetOperationRequest
+    from yandex.cloud.operation.operation_service_pb2_grpc import OperationServiceStub
+
+    client: OperationServiceStub = sdk.client(OperationServiceStub)
+    deadline = time.monotonic() + timeout
+    delays = backoff(delay, max_delay)
+    while not operation.done:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise OperationError(operation, f'timed out waiting for operation {operation.id}')
+        time.sleep(min(next(delays), remaining))
+        operation = client.Get(GetOperationRequest(operation_id=operation.id))
+
+    if operation.HasField('error'):
+        raise OperationError(operation, f'operation {operation.id} failed: {operation.error.message}')
+    return operation
+
+
+def wait_settings(module: AnsibleModule) -> tuple[float, float, float]:
+    return module.params['wait_timeout'], module.params['wait_delay'], module.params['wait_max_delay']
+
+
+def wait_operation(module: AnsibleModule, sdk: SDK, operation: Operation) -> Operation:
+    if not module.params.get('wait'):
+        return operation
+
+    try:
+        with log_grpc_error(module):
+            return poll_operation(sdk, operation, *wait_settings(module))
+    except OperationError as e:
+        module.fail_json(msg=str(e), **MessageToDict(e.operation))
+
+
+def file_sha256(filename: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
 
 
 class NotFound(ValueError):
     ...
+
+
+class OperationError(Exception):
+    def __init__(self, operation: Operation, msg: str) -> None:
+        super().__init__(msg)
+        self.operation = operation
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import os
+import tempfile
+import time
+from typing import Any
+from typing import Generator
+
+DEFAULT_CACHE_DIR = '~/.cache/yandexcloud'
+
+
+class FileCache:
+    # a json document shared by concurrent module runs on the same host,
+    # every read-modify-write cycle happens under an exclusive flock
+    def __init__(self, directory: str, name: str) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.path = os.path.join(self.directory, f'{name}.json')
+
+    @contextlib.contextmanager
+    def locked(self) -> Generator[dict[str, Any], None, None]:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        with open(f'{self.path}.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                data = self._load()
+                before = json.dumps(data, sort_keys=True)
+                yield data
+                if json.dumps(data, sort_keys=True) != before:
+                    self._dump(data)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _dump(self, data: dict[str, Any]) -> None:
+        # mkstemp creates the file with 0600, replace is atomic for readers without the lock
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+
+
+class NameCache:
+    # folder-scoped name -> id mapping for name lookups, entries expire after ttl seconds
+    def __init__(self, directory: str, ttl: int, prefetch: bool = False) -> None:
+        self._cache = FileCache(directory, 'names')
+        self.ttl = ttl
+        self.prefetch = prefetch
+        # entries handed out by this process, dropped if an id turns out to be gone
+        self.served: set[tuple[str, str, str]] = set()
+
+    def get(self, kind: str, folder_id: str, name: str) -> str | None:
+        with self._cache.locked() as data:
+            entry = data.get(f'{kind}/{folder_id}', {}).get(name)
+        if entry is None or entry[1] <= time.time():
+            return None
+        self.served.add((kind, folder_id, name))
+        return entry[0]
+
+    def put(self, kind: str, folder_id: str, ids: dict[str, str]) -> None:
+        now = time.time()
+        with self._cache.locked() as data:
+            folder = {k: v for k, v in data.get(f'{kind}/{folder_id}', {}).items() if v[1] > now}
+            folder.update({name: [id, now + self.ttl] for name, id in ids.items()})
+            data[f'{kind}/{folder_id}'] = folder
+
+    def invalidate_served(self) -> None:
+        with self._cache.locked() as data:
+            for kind, folder_id, name in list(self.served):
+                data.get(f'{kind}/{folder_id}', {}).pop(name, None)
+        self.served.clear()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from contextlib import suppress
+from typing import Any
+from typing import Mapping
+from typing import TYPE_CHECKING
+from typing import TypedDict
+
+with suppress(ImportError):
+    from google.protobuf.field_mask_pb2 import FieldMask
+    from google.protobuf.json_format import MessageToDict
+    from google.protobuf.json_format import ParseDict
+    from google.protobuf.json_format import ParseError
+
+if TYPE_CHECKING:
+    from google.protobuf.message import Message
+
+
+class Diff(TypedDict):
+    before: dict[str, Any]
+    after: dict[str, Any]
+
+
+def to_dict(message: Message) -> dict[str, Any]:
+    return MessageToDict(message, preserving_proto_field_name=True)
+
+
+def matches(current: Any, desired: Any) -> bool:
+    # desired matches when every field it sets has the current value: fields the server fills in are ignored,
+    # and list elements are matched regardless of their order
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(matches(current.get(k), v) for k, v in desired.items())
+    if isinstance(desired, list):
+        if not isinstance(current, list) or len(current) != len(desired):
+            return False
+        remaining = list(current)
+        for d in desired:
+            i = next((i for i, c in enumerate(remaining) if matches(c, d)), None)
+            if i is None:
+                return False
+            del remaining[i]
+        return True
+    return current == desired
+
+
+def compare(current: Message, desired: Mapping[str, Any]) -> Diff:
+    # desired is keyed by the fields of the current resource, None means the field is not managed.
+    # desired values go through the same message type, so enums, int64 and durations are compared canonically
+    managed = {k: v for k, v in desired.items() if v is not None}
+    probe = type(current)()
+    try:
+        ParseDict(managed, probe)
+    except ParseError as e:
+        raise ValueError(str(e)) from e
+
+    fields = current.DESCRIPTOR.fields_by_name
+    before, after = to_dict(current), to_dict(probe)
+    diff: Diff = {'before': {}, 'after': {}}
+    for field in managed:
+        message_type = fields[field].message_type
+        # maps are managed as a whole, nested messages only by the fields that are set
+        if message_type is not None and not message_type.GetOptions().map_entry:
+            same = matches(before.get(field), after.get(field))
+        else:
+            same = before.get(field) == after.get(field)
+        if not same:
+            diff['before'][field] = before.get(field)
+            diff['after'][field] = after.get(field)
+    return diff
+
+
+def update_mask(diff: Diff, paths: Mapping[str, str] | None = None) -> FieldMask:
+    # paths maps resource fields to update request fields when their names differ
+    paths = paths or {}
+    return FieldMask(paths=[paths.get(field, field) for field in diff['after']])
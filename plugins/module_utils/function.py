@@ -1,23 +1,137 @@
 from __future__ import annotations
 
+import contextlib
+import hashlib
+from typing import Any
+from typing import Generator
+from typing import Mapping
+
+import grpc
+from yandex.cloud.serverless.functions.v1.function_pb2 import ScalingPolicy
+from yandex.cloud.serverless.functions.v1.function_pb2 import Version
+from yandex.cloud.serverless.functions.v1.function_service_pb2 import GetFunctionVersionByTagRequest
 from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsRequest
 from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsVersionsRequest
 from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
 
+from ..module_utils.archive import map_file
+from ..module_utils.archive import MappedFile
+from ..module_utils.archive import validate_zip
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import paginate
+from ..module_utils.basic import resolve_id
+from ..module_utils.cache import NameCache
+from ..module_utils.diff import compare
+
+# settings shared by CreateFunctionVersionRequest and Version
+VERSION_FIELDS = (
+    'runtime',
+    'entrypoint',
+    'resources',
+    'service_account_id',
+    'description',
+    'environment',
+    'connectivity',
+    'named_service_accounts',
+    'secrets',
+)
+POLICY_FIELDS = ('provisioned_instances_count', 'zone_instances_limit', 'zone_requests_limit')
+
 
+def get_function_id(
+    client: FunctionServiceStub,
+    folder_id: str,
+    name: str,
+    cache: NameCache | None = None,
+) -> str:
+    return resolve_id(
+        cache,
+        'function',
+        folder_id,
+        name,
+        lambda: _find_function_id(client, folder_id, name),
+        lambda: get_function_ids(client, folder_id),
+    )
 
-def get_function_id(client: FunctionServiceStub, folder_id: str, name: str) -> str:
+
+def _find_function_id(client: FunctionServiceStub, folder_id: str, name: str) -> str:
     # get the latest function
-    functions = client.List(ListFunctionsRequest(folder_id=folder_id, filter=f'name="{name}"')).functions
-    if not functions:
+    function = next(
+        paginate(client.List, ListFunctionsRequest(folder_id=folder_id, filter=f'name="{name}"'), 'functions', limit=1),
+        None,
+    )
+    if function is None:
         raise NotFound(f'function {name} not found')
-    return functions[0].id
+    return function.id
 
 
-def get_function_version_id(client, function_id) -> str:
+def get_function_version(client: FunctionServiceStub, function_id: str) -> Version:
     # get latest version
-    versions = client.ListVersions(ListFunctionsVersionsRequest(function_id=function_id)).versions
-    if not versions:
+    version = next(
+        paginate(client.ListVersions, ListFunctionsVersionsRequest(function_id=function_id), 'versions', limit=1),
+        None,
+    )
+    if version is None:
         raise NotFound(f'no versions for function {function_id}')
-    return versions[0].id
+    return version
+
+
+def get_function_version_id(client, function_id) -> str:
+    return get_function_version(client, function_id).id
+
+
+def get_latest_version(client: FunctionServiceStub, function_id: str) -> Version | None:
+    try:
+        return client.GetVersionByTag(GetFunctionVersionByTagRequest(function_id=function_id, tag='$latest'))
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.NOT_FOUND:
+            return None
+        raise
+
+
+def content_tag(sha256: str) -> str:
+    # versions don't expose a hash of their content, so the deployed one is kept as a version tag
+    return f'sha256-{sha256[:32].lower()}'
+
+
+@contextlib.contextmanager
+def open_archive(filename: str, crc: bool = False) -> Generator[tuple[MappedFile, str], None, None]:
+    # the archive is mapped once and shared by validation, hashing and the request
+    with map_file(filename) as archive:
+        validate_zip(archive, crc=crc)
+        yield archive, hashlib.sha256(archive).hexdigest()
+
+
+def is_deployed(latest: Version | None, settings: Mapping[str, Any], execution_timeout: str) -> bool:
+    # the same archive with the same settings is already deployed, the content tag stands for the archive
+    if latest is None or not set(settings['tag']) <= set(latest.tags):
+        return False
+    desired = {field: settings[field] for field in VERSION_FIELDS}
+    desired['execution_timeout'] = execution_timeout
+    return not compare(latest, desired)['after']
+
+
+def fill_policy(current: ScalingPolicy | None, policy: Mapping[str, Any]) -> dict[str, Any]:
+    # SetScalingPolicy replaces the whole policy, so limits that are not set keep their current values
+    if current is None:
+        return dict(policy)
+    return {**policy, **{field: getattr(current, field) for field in POLICY_FIELDS if policy.get(field) is None}}
+
+
+def get_function_ids(client: FunctionServiceStub, folder_id: str, cache: NameCache | None = None) -> dict[str, str]:
+    items = paginate(client.List, ListFunctionsRequest(folder_id=folder_id), 'functions', page_size=1000)
+    ids = {i.name: i.id for i in items}
+    if cache is not None:
+        cache.put('function', folder_id, ids)
+    return ids
+
+
+def get_latest_versions(client: FunctionServiceStub, folder_id: str) -> dict[str, Version]:
+    # the latest version of every function in the folder from a single listing
+    latest: dict[str, Version] = {}
+    request = ListFunctionsVersionsRequest(folder_id=folder_id)
+    for v in paginate(client.ListVersions, request, 'versions', page_size=1000):
+        prev = latest.get(v.function_id)
+        if prev is None or v.created_at.ToNanoseconds() > prev.created_at.ToNanoseconds():
+            latest[v.function_id] = v
+    return latest
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any
+from typing import TYPE_CHECKING
+
+from ..module_utils.cache import FileCache
+
+if TYPE_CHECKING:
+    from yandex.cloud.iam.v1.iam_token_service_pb2 import CreateIamTokenRequest
+
+IAM_ENDPOINT = 'iam.api.cloud.yandex.net:443'
+IAM_TOKEN_AUDIENCE = 'https://iam.api.cloud.yandex.net/iam/v1/tokens'
+# iam tokens live up to 12 hours, the api recommends to request a new one every hour
+REFRESH_MARGIN = 11 * 60 * 60
+
+
+def token_cache_key(auth_settings: dict[str, Any]) -> str:
+    sa_key = auth_settings.get('service_account_key')
+    if sa_key:
+        return f'sa:{sa_key["id"]}'
+    return 'oauth:' + hashlib.sha256(auth_settings['token'].encode()).hexdigest()
+
+
+def token_request(auth_settings: dict[str, Any]) -> CreateIamTokenRequest:
+    # the iam stubs are imported only when a token is exchanged, cached tokens don't need them
+    from yandex.cloud.iam.v1.iam_token_service_pb2 import CreateIamTokenRequest
+
+    sa_key = auth_settings.get('service_account_key')
+    if not sa_key:
+        return CreateIamTokenRequest(yandex_passport_oauth_token=auth_settings['token'])
+
+    # jwt and cryptography are only needed for service account keys
+    import jwt
+
+    now = int(time.time())
+    payload = {'iss': sa_key['service_account_id'], 'aud': IAM_TOKEN_AUDIENCE, 'iat': now, 'exp': now + 360}
+    encoded = jwt.encode(payload, sa_key['private_key'], algorithm='PS256', headers={'kid': sa_key['id']})
+    return CreateIamTokenRequest(jwt=encoded)
+
+
+def create_iam_token(auth_settings: dict[str, Any]) -> tuple[str, float]:
+    import grpc
+    from yandex.cloud.iam.v1.iam_token_service_pb2_grpc import IamTokenServiceStub
+
+    with grpc.secure_channel(IAM_ENDPOINT, grpc.ssl_channel_credentials()) as channel:
+        resp = IamTokenServiceStub(channel).Create(token_request(auth_settings))
+    return resp.iam_token, resp.expires_at.ToSeconds()
+
+
+def get_iam_token(cache_dir: str, auth_settings: dict[str, Any]) -> str:
+    key = token_cache_key(auth_settings)
+    # parallel forks wait on the lock while the first one exchanges the key
+    with FileCache(cache_dir, 'iam_tokens').locked() as tokens:
+        now = time.time()
+        for k in [k for k, v in tokens.items() if v['expires_at'] <= now]:
+            del tokens[k]
+
+        entry = tokens.get(key)
+        if entry is None or entry['expires_at'] - REFRESH_MARGIN <= now:
+            iam_token, expires_at = create_iam_token(auth_settings)
+            entry = tokens[key] = {'iam_token': iam_token, 'expires_at': expires_at}
+        return entry['iam_token']
@@ -1,15 +1,75 @@
 from __future__ import annotations
 
+from typing import Any
+from typing import Mapping
+
 from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import ListNetworkLoadBalancersRequest
 from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2_grpc import NetworkLoadBalancerServiceStub
 
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import paginate
+from ..module_utils.basic import resolve_id
+from ..module_utils.cache import NameCache
+
 
+def get_nlb_id(
+    client: NetworkLoadBalancerServiceStub,
+    folder_id: str,
+    name: str,
+    cache: NameCache | None = None,
+) -> str:
+    return resolve_id(
+        cache,
+        'nlb',
+        folder_id,
+        name,
+        lambda: _find_nlb_id(client, folder_id, name),
+        lambda: get_nlb_ids(client, folder_id),
+    )
 
-def get_nlb_id(client: NetworkLoadBalancerServiceStub, folder_id: str, name: str) -> str:
-    nlbs = client.List(
-        ListNetworkLoadBalancersRequest(folder_id=folder_id, filter=f'name="{name}"'),
-    ).network_load_balancers
-    if not nlbs:
+
+def _find_nlb_id(client: NetworkLoadBalancerServiceStub, folder_id: str, name: str) -> str:
+    nlb = next(
+        paginate(
+            client.List,
+            ListNetworkLoadBalancersRequest(folder_id=folder_id, filter=f'name="{name}"'),
+            'network_load_balancers',
+            limit=1,
+        ),
+        None,
+    )
+    if nlb is None:
         raise NotFound(f'function {name} not found')
-    return nlbs[0].id
+    return nlb.id
+
+
+def get_nlb_ids(
+    client: NetworkLoadBalancerServiceStub,
+    folder_id: str,
+    cache: NameCache | None = None,
+) -> dict[str, str]:
+    items = paginate(
+        client.List,
+        ListNetworkLoadBalancersRequest(folder_id=folder_id),
+        'network_load_balancers',
+        page_size=1000,
+    )
+    ids = {i.name: i.id for i in items}
+    if cache is not None:
+        cache.put('nlb', folder_id, ids)
+    return ids
+
+
+def listener_from_spec(spec: Mapping[str, Any]) -> dict[str, Any]:
+    # ListenerSpec as the Listener it turns into, to compare it with NetworkLoadBalancer.listeners
+    address_spec = spec.get('external_address_spec') or spec.get('internal_address_spec') or {}
+    listener = {
+        'name': spec['name'],
+        'address': address_spec.get('address'),
+        'port': spec['port'],
+        'protocol': spec['protocol'],
+        'target_port': spec.get('target_port') or spec['port'],
+        'subnet_id': address_spec.get('subnet_id'),
+        'ip_version': address_spec.get('ip_version'),
+    }
+    return {k: v for k, v in listener.items() if v is not None}
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import zipfile
+from typing import Any
+
+from ..module_utils.basic import file_sha256
+from ..module_utils.cache import FileCache
+
+# the earliest timestamp zip can store, used for every entry to make archives reproducible
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def iter_files(source_dir: str) -> list[str]:
+    files = []
+    for root, dirs, names in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(names):
+            files.append(os.path.relpath(os.path.join(root, name), source_dir))
+    return files
+
+
+def build_manifest(source_dir: str, previous: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    # files with the same size and mtime as in the previous build are not hashed again
+    manifest = {}
+    for rel in iter_files(source_dir):
+        st = os.stat(os.path.join(source_dir, rel))
+        prev = previous.get(rel)
+        if prev and prev['size'] == st.st_size and prev['mtime_ns'] == st.st_mtime_ns:
+            sha256 = prev['sha256']
+        else:
+            sha256 = file_sha256(os.path.join(source_dir, rel))
+        manifest[rel] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'mode': 0o755 if st.st_mode & stat.S_IXUSR else 0o644,
+            'sha256': sha256,
+        }
+    return manifest
+
+
+def manifest_digest(manifest: dict[str, dict[str, Any]]) -> str:
+    # mtimes are left out, the archive doesn't depend on them
+    content = [(rel, entry['mode'], entry['sha256']) for rel, entry in sorted(manifest.items())]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+def write_zip(source_dir: str, manifest: dict[str, dict[str, Any]], filename: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), prefix='.', suffix='.zip')
+    try:
+        with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w') as zf:
+            for rel, entry in sorted(manifest.items()):
+                info = zipfile.ZipInfo(rel.replace(os.sep, '/'), ZIP_EPOCH)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = (stat.S_IFREG | entry['mode']) << 16
+                with open(os.path.join(source_dir, rel), 'rb') as src, zf.open(info, 'w') as dst:
+                    shutil.copyfileobj(src, dst)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def build_package(source_dir: str, cache_dir: str) -> str:
+    # archives are cached per source directory and rebuilt only when the tree content changes
+    source_dir = os.path.realpath(source_dir)
+    if not os.path.isdir(source_dir):
+        raise NotADirectoryError(f'{source_dir} is not a directory')
+    key = hashlib.sha256(source_dir.encode()).hexdigest()[:16]
+    cache = FileCache(os.path.join(cache_dir, 'packages'), key)
+    filename = os.path.join(cache.directory, f'{key}.zip')
+    with cache.locked() as state:
+        manifest = build_manifest(source_dir, state.get('files', {}))
+        digest = manifest_digest(manifest)
+        if state.get('digest') != digest or not os.path.exists(filename):
+            write_zip(source_dir, manifest, filename)
+        state['files'] = manifest
+        state['digest'] = digest
+    return filename
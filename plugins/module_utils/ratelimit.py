@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+from typing import Callable
+from typing import Mapping
+
+import grpc
+
+from ..module_utils.cache import FileCache
+
+# rate limited services by the package of their grpc methods
+SERVICES = {
+    'functions': '/yandex.cloud.serverless.functions.',
+    'apigateway': '/yandex.cloud.serverless.apigateway.',
+    'dns': '/yandex.cloud.dns.',
+    'loadbalancer': '/yandex.cloud.loadbalancer.',
+}
+
+
+def service_of(method: str) -> str | None:
+    return next((service for service, prefix in SERVICES.items() if method.startswith(prefix)), None)
+
+
+class TokenBucket:
+    # one bucket per service in a file shared by every fork on the controller,
+    # a call takes a token or sleeps until the bucket refills enough for one
+    def __init__(self, directory: str, rates: Mapping[str, float], burst: int | None = None) -> None:
+        self._cache = FileCache(directory, 'ratelimit')
+        self.rates = rates
+        self.burst = burst
+
+    def acquire(self, service: str) -> None:
+        rate = self.rates[service]
+        capacity = self.burst or max(rate, 1.0)
+        while True:
+            with self._cache.locked() as buckets:
+                now = time.time()
+                tokens, updated = buckets.get(service, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                if tokens >= 1:
+                    buckets[service] = (tokens - 1, now)
+                    return
+                buckets[service] = (tokens, now)
+            time.sleep((1 - tokens) / rate)
+
+
+class RateLimitInterceptor(grpc.UnaryUnaryClientInterceptor):
+    # wraps another interceptor and takes a token before each of its attempts, so retries are paced as well
+    def __init__(self, interceptor: grpc.UnaryUnaryClientInterceptor, bucket: TokenBucket) -> None:
+        self.interceptor = interceptor
+        self.bucket = bucket
+
+    def intercept_unary_unary(
+        self,
+        continuation: Callable[[grpc.ClientCallDetails, Any], Any],
+        client_call_details: grpc.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        def attempt(details: grpc.ClientCallDetails, req: Any) -> Any:
+            service = service_of(details.method)
+            if service in self.bucket.rates:
+                self.bucket.acquire(service)
+            return continuation(details, req)
+
+        return self.interceptor.intercept_unary_unary(attempt, client_call_details, request)
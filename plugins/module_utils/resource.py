@@ -1,26 +1,42 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import Callable
 from typing import Iterable
 from typing import Mapping
 from typing import Protocol
 from typing import TYPE_CHECKING
 from typing import TypedDict
 
+from google.protobuf.json_format import MessageToDict
 from yandex.cloud.access.access_pb2 import AccessBinding
 from yandex.cloud.access.access_pb2 import AccessBindingDelta
+from yandex.cloud.access.access_pb2 import ADD
+from yandex.cloud.access.access_pb2 import ListAccessBindingsRequest
+from yandex.cloud.access.access_pb2 import ListAccessBindingsResponse
 from yandex.cloud.access.access_pb2 import REMOVE
 from yandex.cloud.access.access_pb2 import SetAccessBindingsRequest
 from yandex.cloud.access.access_pb2 import Subject
 from yandex.cloud.access.access_pb2 import UpdateAccessBindingsRequest
 
+from ..module_utils.basic import log_error
+from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import NotFound
+from ..module_utils.basic import paginate
+from ..module_utils.basic import poll_operation
+from ..module_utils.basic import run_concurrently
+from ..module_utils.basic import wait_settings
 
 if TYPE_CHECKING:
-    from yandex.cloud.operation.operation_pb2 import Operation
+    from ansible.module_utils.basic import AnsibleModule
     from grpc import UnaryUnaryMultiCallable
+    from yandex.cloud.operation.operation_pb2 import Operation
+
+    from ..module_utils.sdk import SDK
 
 
 class ABClient(Protocol):
+    ListAccessBindings: UnaryUnaryMultiCallable[ListAccessBindingsRequest, ListAccessBindingsResponse]
     SetAccessBindings: UnaryUnaryMultiCallable[SetAccessBindingsRequest, Operation]
     UpdateAccessBindings: UnaryUnaryMultiCallable[UpdateAccessBindingsRequest, Operation]
 
@@ -30,6 +46,12 @@ class LikeAB(TypedDict):
     subject: Mapping[str, str]
 
 
+class LikeResource(TypedDict):
+    name: str | None
+    resource_id: str | None
+    access_bindings: list[LikeAB]
+
+
 def to_ab(d: LikeAB) -> AccessBinding:
     return AccessBinding(role_id=d['role_id'], subject=Subject(id=d['subject']['id'], type=d['subject']['type']))
 
@@ -48,25 +70,128 @@ def remove_access_bindings(client: ABClient, resource_id: str, access_bindings:
     )
 
 
+def binding_key(b: AccessBinding) -> tuple[str, str, str]:
+    return b.role_id, b.subject.type, b.subject.id
+
+
+def access_binding_deltas(
+    current: Iterable[AccessBinding],
+    desired: Iterable[AccessBinding],
+    state: str,
+) -> list[AccessBindingDelta]:
+    # present makes the bindings exactly the desired ones, absent removes only the desired ones that exist
+    curr = {binding_key(b): b for b in current}
+    want = {binding_key(b): b for b in desired}
+    if state == 'absent':
+        return [AccessBindingDelta(action=REMOVE, access_binding=b) for k, b in want.items() if k in curr]
+    return [
+        *(AccessBindingDelta(action=ADD, access_binding=b) for k, b in want.items() if k not in curr),
+        *(AccessBindingDelta(action=REMOVE, access_binding=b) for k, b in curr.items() if k not in want),
+    ]
+
+
+def reconcile_access_bindings(
+    client: ABClient,
+    resource_id: str,
+    access_bindings: Iterable[AccessBinding],
+    state: str,
+) -> Operation | None:
+    current = paginate(
+        client.ListAccessBindings,
+        ListAccessBindingsRequest(resource_id=resource_id),
+        'access_bindings',
+        page_size=1000,
+    )
+    deltas = access_binding_deltas(current, access_bindings, state)
+    if not deltas:
+        return None
+    return client.UpdateAccessBindings(
+        UpdateAccessBindingsRequest(resource_id=resource_id, access_binding_deltas=deltas),
+    )
+
+
+def resolve_resource_ids(
+    module: AnsibleModule,
+    resources: list[LikeResource],
+    get_id: Callable[[str], str],
+    get_ids: Callable[[], dict[str, str]],
+) -> None:
+    # a single name is looked up with a filtered List, many names with one List of the whole folder
+    missing = [r for r in resources if not r['resource_id']]
+    if not missing:
+        return
+    if not module.params['folder_id']:
+        module.fail_json(msg='folder_id is required to resolve resources by name')
+
+    with log_error(module, NotFound), log_grpc_error(module):
+        if len(missing) == 1:
+            missing[0]['resource_id'] = get_id(missing[0]['name'])
+            return
+        ids = get_ids()
+        for r in missing:
+            if r['name'] not in ids:
+                raise NotFound(f'{r["name"]} not found')
+            r['resource_id'] = ids[r['name']]
+
+
+def apply_access_bindings(
+    module: AnsibleModule,
+    sdk: SDK,
+    client: ABClient,
+    resources: list[LikeResource],
+) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+    state = module.params['state']
+
+    def apply(resource: LikeResource) -> dict[str, Any]:
+        abs = [to_ab(ab) for ab in resource['access_bindings']]
+        if module.params['reconcile']:
+            resp = reconcile_access_bindings(client, resource['resource_id'], abs, state)
+            if resp is None:
+                return {}
+        elif state == 'present':
+            resp = set_access_bindings(client, resource['resource_id'], abs)
+        else:
+            resp = remove_access_bindings(client, resource['resource_id'], abs)
+        if module.params['wait']:
+            resp = poll_operation(sdk, resp, *wait_settings(module))
+        return MessageToDict(resp)
+
+    calls = {r['resource_id']: (lambda r=r: apply(r)) for r in resources}
+    return run_concurrently(calls, module.params['max_workers'])
+
+
 def default_arg_spec() -> dict[str, dict[str, Any]]:
+    access_bindings = {
+        'type': 'list',
+        'elements': 'dict',
+        'options': {
+            'role_id': {'type': 'str', 'required': True},
+            'subject': {
+                'type': 'dict',
+                'options': {
+                    'id': {'type': 'str', 'required': True},
+                    'type': {'type': 'str', 'required': True},
+                },
+            },
+        },
+    }
     return {
         'name': {'type': 'str'},
         'resource_id': {'type': 'str'},
         'folder_id': {'type': 'str'},
-        'access_bindings': {
+        'access_bindings': access_bindings,
+        'resources': {
             'type': 'list',
-            'required': True,
+            'elements': 'dict',
             'options': {
-                'role_id': {'type': 'str', 'required': True},
-                'subject': {
-                    'type': 'dict',
-                    'options': {
-                        'id': {'type': 'str', 'required': True},
-                        'type': {'type': 'str', 'required': True},
-                    },
-                },
+                'name': {'type': 'str'},
+                'resource_id': {'type': 'str'},
+                'access_bindings': {**access_bindings, 'required': True},
             },
+            'required_one_of': [('resource_id', 'name')],
         },
+        'max_workers': {'type': 'int', 'default': 10},
+        'reconcile': {'type': 'bool', 'default': False},
         'state': {
             'type': 'str',
             'default': 'present',
@@ -76,7 +201,11 @@ def default_arg_spec() -> dict[str, dict[str, Any]]:
 
 
 def default_required_one_of() -> list[tuple[str, ...]]:
-    return [('resource_id', 'name')]
+    return [('resource_id', 'name', 'resources'), ('access_bindings', 'resources')]
+
+
+def default_mutually_exclusive() -> list[tuple[str, ...]]:
+    return [('resources', 'resource_id'), ('resources', 'name'), ('resources', 'access_bindings')]
 
 
 def default_required_by() -> dict[str, str]:
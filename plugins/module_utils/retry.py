@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from collections import namedtuple
+from typing import Any
+from typing import Callable
+from typing import Generator
+from typing import Iterable
+
+import grpc
+
+DEFAULT_RETRY_CODES = ('UNAVAILABLE', 'RESOURCE_EXHAUSTED')
+
+
+def backoff(initial: float, maximum: float, multiplier: float = 2.0) -> Generator[float, None, None]:
+    # exponential backoff with equal jitter: half of the delay is fixed, the other half is random
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)
+        delay = min(delay * multiplier, maximum)
+
+
+class ClientCallDetails(
+    namedtuple('ClientCallDetails', ('method', 'timeout', 'metadata', 'credentials', 'wait_for_ready', 'compression')),
+    grpc.ClientCallDetails,
+):
+    pass
+
+
+class RetryInterceptor(grpc.UnaryUnaryClientInterceptor):
+    # deadline is the budget of a call with all its retries, every attempt gets what is left of it as its grpc deadline,
+    # capped by attempt_timeout. An attempt that ran out of its own timeout is retried while the budget lasts
+    def __init__(
+        self,
+        max_retry_count: int = 5,
+        retriable_codes: Iterable[str] = DEFAULT_RETRY_CODES,
+        deadline: float | None = None,
+        attempt_timeout: float | None = None,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 10.0,
+        backoff_multiplier: float = 2.0,
+    ) -> None:
+        self.max_retry_count = max_retry_count
+        self.retriable_codes = {grpc.StatusCode[code] for code in retriable_codes}
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.backoff = (backoff_initial, backoff_max, backoff_multiplier)
+
+    def intercept_unary_unary(
+        self,
+        continuation: Callable[[grpc.ClientCallDetails, Any], Any],
+        client_call_details: grpc.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        deadline = None
+        budgets = [b for b in (self.deadline, client_call_details.timeout) if b is not None]
+        if budgets:
+            deadline = time.monotonic() + min(budgets)
+        # the same idempotency key on every attempt, so a retried mutation is applied once
+        metadata = [*(client_call_details.metadata or ()), ('idempotency-key', str(uuid.uuid4()))]
+        delays = backoff(*self.backoff)
+
+        attempt = 0
+        while True:
+            timeout = self.attempt_timeout
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0.0)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            details = ClientCallDetails(
+                client_call_details.method,
+                timeout,
+                metadata + [('x-retry-attempt', str(attempt))] if attempt else metadata,
+                client_call_details.credentials,
+                getattr(client_call_details, 'wait_for_ready', None),
+                getattr(client_call_details, 'compression', None),
+            )
+            call = continuation(details, request)
+            code = call.code()
+
+            attempt_timed_out = (
+                code == grpc.StatusCode.DEADLINE_EXCEEDED
+                and self.attempt_timeout is not None
+                and (deadline is None or time.monotonic() < deadline)
+            )
+            if code == grpc.StatusCode.OK or attempt >= self.max_retry_count:
+                return call
+            if code not in self.retriable_codes and not attempt_timed_out:
+                return call
+            delay = next(delays)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                return call
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import TypeVar
+
+import grpc
+
+from ..module_utils.iam import create_iam_token
+from ..module_utils.iam import REFRESH_MARGIN
+
+S = TypeVar('S')
+
+# services by the package of their stubs, a module connects only to the endpoints of the stubs it uses
+ENDPOINTS = {
+    'yandex.cloud.serverless.functions.': 'serverless-functions.api.cloud.yandex.net:443',
+    'yandex.cloud.serverless.apigateway.': 'serverless-apigateway.api.cloud.yandex.net:443',
+    'yandex.cloud.dns.': 'dns.api.cloud.yandex.net:443',
+    'yandex.cloud.loadbalancer.': 'load-balancer.api.cloud.yandex.net:443',
+    'yandex.cloud.operation.': 'operation.api.cloud.yandex.net:443',
+    'yandex.cloud.iam.': 'iam.api.cloud.yandex.net:443',
+}
+
+
+def endpoint_for(stub: Callable[..., Any]) -> str:
+    for package, endpoint in ENDPOINTS.items():
+        if stub.__module__.startswith(package):
+            return endpoint
+    raise ValueError(f'no endpoint known for {stub.__name__}, set endpoint to discover it')
+
+
+class IamTokenAuth(grpc.AuthMetadataPlugin):
+    # the token is requested with the first call and renewed as the iam api recommends
+    def __init__(self, auth_settings: dict[str, Any]) -> None:
+        self.auth_settings = auth_settings
+        self.iam_token = auth_settings.get('iam_token')
+        self.expires_at = math.inf if self.iam_token else 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, context: grpc.AuthMetadataContext, callback: grpc.AuthMetadataPluginCallback) -> None:
+        try:
+            callback((('authorization', f'Bearer {self.token()}'),), None)
+        except Exception as e:
+            callback((), e)
+
+    def token(self) -> str:
+        with self.lock:
+            if self.expires_at - REFRESH_MARGIN <= time.time():
+                self.iam_token, self.expires_at = create_iam_token(self.auth_settings)
+            return self.iam_token
+
+
+class SDK:
+    # a stand-in for yandexcloud.SDK without endpoint discovery and without importing the stubs of every service
+    def __init__(self, interceptor: grpc.UnaryUnaryClientInterceptor, auth_settings: dict[str, Any]) -> None:
+        self.interceptor = interceptor
+        self.credentials = grpc.composite_channel_credentials(
+            grpc.ssl_channel_credentials(),
+            grpc.metadata_call_credentials(IamTokenAuth(auth_settings)),
+        )
+        self._channels: dict[str, grpc.Channel] = {}
+        self._lock = threading.Lock()
+
+    def client(self, stub: Callable[[grpc.Channel], S]) -> S:
+        endpoint = endpoint_for(stub)
+        with self._lock:
+            if endpoint not in self._channels:
+                channel = grpc.secure_channel(endpoint, self.credentials)
+                self._channels[endpoint] = grpc.intercept_channel(channel, self.interceptor)
+            return stub(self._channels[endpoint])
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import suppress
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import TYPE_CHECKING
+
+from ..module_utils.basic import paginate
+from ..module_utils.basic import run_concurrently
+from ..module_utils.diff import to_dict
+
+with suppress(ImportError):
+    from yandex.cloud.dns.v1.dns_zone_service_pb2 import ListDnsZonesRequest
+    from yandex.cloud.dns.v1.dns_zone_service_pb2_grpc import DnsZoneServiceStub
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import ListNetworkLoadBalancersRequest
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2_grpc import NetworkLoadBalancerServiceStub
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import ListApiGatewayRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2_grpc import ApiGatewayServiceStub
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsVersionsRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListScalingPoliciesRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
+
+if TYPE_CHECKING:
+    from google.protobuf.message import Message
+
+    from ..module_utils.sdk import SDK
+
+# version tags are a field of the version, so versions carry them
+KINDS = ('functions', 'versions', 'scaling_policies', 'api_gateways', 'dns_zones', 'network_load_balancers')
+Record = Dict[str, Any]
+
+
+def canonical(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def to_record(kind: str, message: Message) -> Record:
+    data = to_dict(message)
+    # scaling policies have no id of their own, a function has one policy per tag
+    id = data.get('id') or f'{data["function_id"]}/{data["tag"]}'
+    return {
+        'kind': kind,
+        'id': id,
+        'name': data.get('name') or data.get('tag'),
+        'hash': hashlib.sha256(canonical(data).encode()).hexdigest(),
+        'data': data,
+    }
+
+
+def collect(sdk: SDK, folder_id: str, kinds: Iterable[str], max_workers: int) -> tuple[list[Record], dict[str, str]]:
+    functions = sdk.client(FunctionServiceStub)
+    kinds = set(kinds)
+
+    def listing(kind: str, method: Callable[[Any], Any], request: Message, field: str) -> list[Record]:
+        return [to_record(kind, m) for m in paginate(method, request, field, page_size=1000)]
+
+    calls = {
+        'functions': lambda: listing(
+            'functions',
+            functions.List,
+            ListFunctionsRequest(folder_id=folder_id),
+            'functions',
+        ),
+        'versions': lambda: listing(
+            'versions',
+            functions.ListVersions,
+            ListFunctionsVersionsRequest(folder_id=folder_id),
+            'versions',
+        ),
+        'api_gateways': lambda: listing(
+            'api_gateways',
+            sdk.client(ApiGatewayServiceStub).List,
+            ListApiGatewayRequest(folder_id=folder_id),
+            'api_gateways',
+        ),
+        'dns_zones': lambda: listing(
+            'dns_zones',
+            sdk.client(DnsZoneServiceStub).List,
+            ListDnsZonesRequest(folder_id=folder_id),
+            'dns_zones',
+        ),
+        'network_load_balancers': lambda: listing(
+            'network_load_balancers',
+            sdk.client(NetworkLoadBalancerServiceStub).List,
+            ListNetworkLoadBalancersRequest(folder_id=folder_id),
+            'network_load_balancers',
+        ),
+    }
+    # scaling policies are listed per function, so functions are needed for them
+    needed = kinds | {'functions'} if 'scaling_policies' in kinds else kinds
+    listed, errors = run_concurrently({k: call for k, call in calls.items() if k in needed}, max_workers)
+
+    if 'scaling_policies' in kinds and 'functions' in listed:
+        policies, policy_errors = run_concurrently(
+            {
+                f'scaling_policies/{r["id"]}': (
+                    lambda function_id=r['id']: listing(
+                        'scaling_policies',
+                        functions.ListScalingPolicies,
+                        ListScalingPoliciesRequest(function_id=function_id),
+                        'scaling_policies',
+                    )
+                )
+                for r in listed['functions']
+            },
+            max_workers,
+        )
+        listed.update(policies)
+        errors.update(policy_errors)
+        if 'functions' not in kinds:
+            del listed['functions']
+
+    records = [r for rs in listed.values() for r in rs]
+    return sorted(records, key=lambda r: (r['kind'], r['name'] or '', r['id'])), errors
+
+
+def write_snapshot(filename: str, records: Iterable[Record], check_mode: bool = False) -> bool:
+    # one canonical json line per resource, the file is replaced only when its content changes
+    content = ''.join(canonical(r) + '\n' for r in records)
+    with suppress(FileNotFoundError), open(filename, encoding='utf-8') as f:
+        if f.read() == content:
+            return False
+    if check_mode:
+        return True
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def read_snapshot(filename: str) -> list[Record]:
+    with open(filename, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def diff_snapshots(before: Iterable[Record], after: Iterable[Record]) -> dict[str, list[dict[str, Any]]]:
+    # resources are matched by kind and id and compared by hash, fields are compared only when hashes differ
+    old = {(r['kind'], r['id']): r for r in before}
+    new = {(r['kind'], r['id']): r for r in after}
+    diff: dict[str, list[dict[str, Any]]] = {'added': [], 'removed': [], 'changed': []}
+    for key in sorted(new.keys() - old.keys()):
+        diff['added'].append({k: new[key][k] for k in ('kind', 'id', 'name')})
+    for key in sorted(old.keys() - new.keys()):
+        diff['removed'].append({k: old[key][k] for k in ('kind', 'id', 'name')})
+    for key in sorted(old.keys() & new.keys()):
+        if old[key]['hash'] == new[key]['hash']:
+            continue
+        a, b = old[key]['data'], new[key]['data']
+        fields = sorted(f for f in a.keys() | b.keys() if a.get(f) != b.get(f))
+        diff['changed'].append(
+            {
+                'kind': key[0],
+                'id': key[1],
+                'name': new[key]['name'],
+                'before': {f: a.get(f) for f in fields},
+                'after': {f: b.get(f) for f in fields},
+            },
+        )
+    return diff
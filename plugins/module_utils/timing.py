@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import time
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+import grpc
+
+from ..module_utils.cache import FileCache
+
+# upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class TimingInterceptor(grpc.UnaryUnaryClientInterceptor):
+    # wraps another interceptor: the outer call gives the total duration of a call with its retries,
+    # the continuation handed to the inner one counts the attempts
+    def __init__(self, interceptor: grpc.UnaryUnaryClientInterceptor, records: list[dict[str, Any]]) -> None:
+        self.interceptor = interceptor
+        self.records = records
+
+    def intercept_unary_unary(
+        self,
+        continuation: Callable[[grpc.ClientCallDetails, Any], Any],
+        client_call_details: grpc.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        attempts = 0
+
+        def attempt(details: grpc.ClientCallDetails, req: Any) -> Any:
+            nonlocal attempts
+            attempts += 1
+            return continuation(details, req)
+
+        record = {
+            'method': client_call_details.method,
+            'start': time.time(),
+            'request_size': request.ByteSize(),
+        }
+        code, response_size = None, 0
+        start = time.monotonic()
+        try:
+            call = self.interceptor.intercept_unary_unary(attempt, client_call_details, request)
+            code = call.code()
+            if code == grpc.StatusCode.OK:
+                response_size = call.result().ByteSize()
+        except grpc.RpcError as e:
+            code = e.code()
+            raise
+        finally:
+            record.update(
+                {
+                    'duration': round(time.monotonic() - start, 6),
+                    'code': code.name if code is not None else 'UNKNOWN',
+                    'retries': max(attempts - 1, 0),
+                    'response_size': response_size,
+                },
+            )
+            self.records.append(record)
+        return call
+
+
+def export_jsonl(filename: str, records: Iterable[dict[str, Any]]) -> None:
+    # forks append to the same file, the lock keeps their lines whole
+    filename = os.path.expanduser(filename)
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with open(filename, 'a', encoding='utf-8') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.write(''.join(json.dumps(r, sort_keys=True) + '\n' for r in records))
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def export_openmetrics(filename: str, records: Iterable[dict[str, Any]]) -> None:
+    # an exposition can't be appended to, so the totals of every run are kept next to it and the file is rewritten
+    filename = os.path.expanduser(filename)
+    state = FileCache(os.path.dirname(filename) or '.', f'.{os.path.basename(filename)}')
+    with state.locked() as series:
+        for r in records:
+            s = series.setdefault(
+                f'{r["method"]} {r["code"]}',
+                {'count': 0, 'sum': 0.0, 'buckets': [0] * len(DURATION_BUCKETS), 'retries': 0, 'bytes': [0, 0]},
+            )
+            s['count'] += 1
+            s['sum'] += r['duration']
+            for i, le in enumerate(DURATION_BUCKETS):
+                if r['duration'] <= le:
+                    s['buckets'][i] += 1
+            s['retries'] += r['retries']
+            s['bytes'][0] += r['request_size']
+            s['bytes'][1] += r['response_size']
+
+        tmp = f'{filename}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(render_openmetrics(series))
+        os.replace(tmp, filename)
+
+
+def render_openmetrics(series: dict[str, dict[str, Any]]) -> str:
+    duration = ['# TYPE yandexcloud_rpc_duration_seconds histogram', '# UNIT yandexcloud_rpc_duration_seconds seconds']
+    retries = ['# TYPE yandexcloud_rpc_retries counter']
+    payload = ['# TYPE yandexcloud_rpc_payload_bytes counter', '# UNIT yandexcloud_rpc_payload_bytes bytes']
+    for key, s in sorted(series.items()):
+        method, code = key.split(' ')
+        labels = f'method="{method}",code="{code}"'
+        for le, count in zip(DURATION_BUCKETS, s['buckets']):
+            duration.append(f'yandexcloud_rpc_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+        duration.append(f'yandexcloud_rpc_duration_seconds_bucket{{{labels},le="+Inf"}} {s["count"]}')
+        duration.append(f'yandexcloud_rpc_duration_seconds_count{{{labels}}} {s["count"]}')
+        duration.append(f'yandexcloud_rpc_duration_seconds_sum{{{labels}}} {s["sum"]:.6f}')
+        retries.append(f'yandexcloud_rpc_retries_total{{{labels}}} {s["retries"]}')
+        payload.append(f'yandexcloud_rpc_payload_bytes_total{{{labels},direction="request"}} {s["bytes"][0]}')
+        payload.append(f'yandexcloud_rpc_payload_bytes_total{{{labels},direction="response"}} {s["bytes"][1]}')
+    return '\n'.join([*duration, *retries, *payload, '# EOF']) + '\n'
+
+
+EXPORTERS = {
+    'jsonl': export_jsonl,
+    'openmetrics': export_openmetrics,
+}
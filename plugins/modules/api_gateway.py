@@ -9,19 +9,26 @@ from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
 from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_operation
+from ..module_utils.diff import compare
+from ..module_utils.diff import to_dict
+from ..module_utils.diff import update_mask
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.serverless.apigateway.v1.apigateway_pb2 import ApiGateway
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import CreateApiGatewayRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import DeleteApiGatewayRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import GetApiGatewayRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import GetOpenapiSpecRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import ListApiGatewayRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import UpdateApiGatewayRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2_grpc import ApiGatewayServiceStub
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     required_if = default_required_if()
 
     argument_spec.update(
@@ -65,7 +72,8 @@ def main() -> NoReturn:
         required_together=required_together,
         supports_check_mode=True,
     )
-    client: ApiGatewayServiceStub = init_sdk(module).client(ApiGatewayServiceStub)
+    sdk = init_sdk(module)
+    client: ApiGatewayServiceStub = sdk.client(ApiGatewayServiceStub)
     result = {}
 
     state = module.params['state']
@@ -87,23 +95,38 @@ def main() -> NoReturn:
             if ags:
                 curr_ag = ags[0]
 
-    with log_grpc_error(module):
+    desired = {'name': name, 'description': description, 'labels': labels, 'connectivity': connectivity}
+    changed = True
+    with log_error(module, ValueError), log_grpc_error(module):
         if state == 'present':
             with log_error(module, FileNotFoundError), open(openapi_spec, encoding='utf-8') as f:
                 openapi_spec = f.read()
             if curr_ag:
-                resp = client.Update(
-                    UpdateApiGatewayRequest(
-                        api_gateway_id=curr_ag.id,
-                        name=name,
-                        description=description,
-                        labels=labels,
-                        connectivity=connectivity,
-                        openapi_spec=openapi_spec,
-                    ),
-                )
-                result.update(MessageToDict(resp))
+                diff = compare(curr_ag, desired)
+                # the spec is not a part of the ApiGateway resource and is fetched separately
+                curr_spec = client.GetOpenapiSpec(GetOpenapiSpecRequest(api_gateway_id=curr_ag.id)).openapi_spec
+                if curr_spec.strip() != openapi_spec.strip():
+                    diff['before']['openapi_spec'] = curr_spec
+                    diff['after']['openapi_spec'] = openapi_spec
+                changed = bool(diff['after'])
+                if changed:
+                    resp = client.Update(
+                        UpdateApiGatewayRequest(
+                            api_gateway_id=curr_ag.id,
+                            update_mask=update_mask(diff),
+                            name=name,
+                            description=description,
+                            labels=labels,
+                            connectivity=connectivity,
+                            openapi_spec=openapi_spec,
+                        ),
+                    )
+                    result.update(MessageToDict(wait_operation(module, sdk, resp)))
+                else:
+                    result['response'] = MessageToDict(curr_ag)
             else:
+                diff = compare(ApiGateway(), desired)
+                diff['after']['openapi_spec'] = openapi_spec
                 resp = client.Create(
                     CreateApiGatewayRequest(
                         folder_id=folder_id,
@@ -114,15 +137,18 @@ def main() -> NoReturn:
                         openapi_spec=openapi_spec,
                     ),
                 )
-                result.update(MessageToDict(resp))
+                result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
         elif state == 'absent':
             if not curr_ag:
                 module.fail_json(f'api gateway {ag_id or name} not found')
+            diff = {'before': to_dict(curr_ag), 'after': {}}
             resp = client.Delete(DeleteApiGatewayRequest(api_gateway_id=curr_ag.id))
-            result.update(MessageToDict(resp))
+            result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
-    module.exit_json(**result, changed=True)
+    if module._diff:
+        result['diff'] = diff
+    module.exit_json(**result, changed=changed)
 
 
 if __name__ == '__main__':
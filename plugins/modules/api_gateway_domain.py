@@ -10,17 +10,21 @@ from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
 from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import name_cache
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_operation
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import AddDomainRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import GetApiGatewayRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import RemoveDomainRequest
     from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2_grpc import ApiGatewayServiceStub
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     required_if = default_required_if()
 
     argument_spec.update(
@@ -52,7 +56,8 @@ def main() -> NoReturn:
         required_together=required_together,
         supports_check_mode=True,
     )
-    client: ApiGatewayServiceStub = init_sdk(module).client(ApiGatewayServiceStub)
+    sdk = init_sdk(module)
+    client: ApiGatewayServiceStub = sdk.client(ApiGatewayServiceStub)
     result = {}
 
     state = module.params['state']
@@ -63,16 +68,22 @@ def main() -> NoReturn:
 
     if not ag_id:
         with log_error(module, NotFound), log_grpc_error(module):
-            ag_id = get_api_gateway_id(client, folder_id, name)
+            ag_id = get_api_gateway_id(client, folder_id, name, name_cache(module))
+
+    with log_grpc_error(module):
+        ag = client.Get(GetApiGatewayRequest(api_gateway_id=ag_id))
+    attached = any(d.domain_id == domain_id for d in ag.attached_domains)
+    if attached == (state == 'present'):
+        module.exit_json(**result, changed=False)
 
     with log_grpc_error(module):
         if state == 'present':
             resp = client.AddDomain(AddDomainRequest(api_gateway_id=ag_id, domain_id=domain_id))
-            result.update(MessageToDict(resp))
+            result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
         elif state == 'absent':
             resp = client.RemoveDomain(RemoveDomainRequest(api_gateway_id=ag_id, domain_id=domain_id))
-            result.update(MessageToDict(resp))
+            result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
     module.exit_json(**result, changed=True)
 
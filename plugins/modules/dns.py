@@ -7,10 +7,17 @@ from ..module_utils.basic import default_arg_spec
 from ..module_utils.basic import default_required_if
 from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
+from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_operation
+from ..module_utils.diff import compare
+from ..module_utils.diff import to_dict
+from ..module_utils.diff import update_mask
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.dns.v1.dns_zone_pb2 import DnsZone
     from yandex.cloud.dns.v1.dns_zone_service_pb2 import CreateDnsZoneRequest
     from yandex.cloud.dns.v1.dns_zone_service_pb2 import DeleteDnsZoneRequest
     from yandex.cloud.dns.v1.dns_zone_service_pb2 import GetDnsZoneRequest
@@ -20,7 +27,7 @@ with suppress(ImportError):
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     argument_spec.update(
         {
             'folder_id': {'type': 'str'},
@@ -60,7 +67,8 @@ def main() -> NoReturn:
         required_if=required_if,
         supports_check_mode=True,
     )
-    client: DnsZoneServiceStub = init_sdk(module).client(DnsZoneServiceStub)
+    sdk = init_sdk(module)
+    client: DnsZoneServiceStub = sdk.client(DnsZoneServiceStub)
     result = {}
 
     state = module.params['state']
@@ -88,25 +96,35 @@ def main() -> NoReturn:
             if zones:
                 curr_dns = zones[0]
 
-    with log_grpc_error(module):
+    changed = True
+    with log_error(module, ValueError), log_grpc_error(module):
         if state == 'present':
             if curr_dns:
-                kw['dns_zone_id'] = dns_zone_id
-                resp = client.Update(UpdateDnsZoneRequest(**kw))
-                result.update(MessageToDict(resp))
+                diff = compare(curr_dns, kw)
+                changed = bool(diff['after'])
+                if changed:
+                    kw['dns_zone_id'] = curr_dns.id
+                    resp = client.Update(UpdateDnsZoneRequest(update_mask=update_mask(diff), **kw))
+                    result.update(MessageToDict(wait_operation(module, sdk, resp)))
+                else:
+                    result['response'] = MessageToDict(curr_dns)
             else:
-                kw['folder_id'] = folder_id
                 kw['zone'] = zone
+                diff = compare(DnsZone(), kw)
+                kw['folder_id'] = folder_id
                 resp = client.Create(CreateDnsZoneRequest(**kw))
-                result.update(MessageToDict(resp))
+                result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
         elif state == 'absent':
             if not curr_dns:
                 module.fail_json(f'dns zone {dns_zone_id or name} not found')
+            diff = {'before': to_dict(curr_dns), 'after': {}}
             resp = client.Delete(DeleteDnsZoneRequest(dns_zone_id=curr_dns.id))
-            result.update(MessageToDict(resp))
+            result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
-    module.exit_json(**result, changed=True)
+    if module._diff:
+        result['diff'] = diff
+    module.exit_json(**result, changed=changed)
 
 
 if __name__ == '__main__':
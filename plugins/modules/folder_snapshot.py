@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import NoReturn
+
+from ..module_utils.basic import default_arg_spec
+from ..module_utils.basic import default_required_if
+from ..module_utils.basic import init_module
+from ..module_utils.basic import init_sdk
+from ..module_utils.basic import log_error
+from ..module_utils.snapshot import collect
+from ..module_utils.snapshot import diff_snapshots
+from ..module_utils.snapshot import KINDS
+from ..module_utils.snapshot import read_snapshot
+from ..module_utils.snapshot import write_snapshot
+
+
+def main() -> NoReturn:
+    argument_spec = default_arg_spec()
+    required_if = default_required_if()
+    argument_spec.update(
+        {
+            'folder_id': {'type': 'str'},
+            'mode': {
+                'type': 'str',
+                'default': 'export',
+                'choices': ['export', 'diff'],
+            },
+            'path': {'type': 'path', 'required': True},
+            'against': {'type': 'path'},
+            'kinds': {
+                'type': 'list',
+                'elements': 'str',
+                'default': list(KINDS),
+                'choices': list(KINDS),
+            },
+            'max_workers': {'type': 'int', 'default': 10},
+        },
+    )
+    required_if.append(('mode', 'export', ('folder_id',)))
+    required_one_of = [
+        ('folder_id', 'against'),
+    ]
+    module = init_module(
+        argument_spec=argument_spec,
+        required_if=required_if,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+    result = {}
+
+    against = module.params['against']
+    if module.params['mode'] == 'export' or against is None:
+        records, errors = collect(
+            init_sdk(module),
+            module.params['folder_id'],
+            module.params['kinds'],
+            module.params['max_workers'],
+        )
+        # a partial snapshot would show the missing kinds as removed
+        if errors:
+            module.fail_json(msg='failed to list folder resources', errors=errors)
+    else:
+        with log_error(module, OSError, ValueError):
+            records = read_snapshot(against)
+
+    if module.params['mode'] == 'export':
+        with log_error(module, OSError):
+            changed = write_snapshot(module.params['path'], records, module.check_mode)
+        result['count'] = len(records)
+        module.exit_json(**result, changed=changed)
+
+    with log_error(module, OSError, ValueError):
+        before = read_snapshot(module.params['path'])
+    kinds = set(module.params['kinds'])
+    diff = diff_snapshots(
+        (r for r in before if r['kind'] in kinds),
+        (r for r in records if r['kind'] in kinds),
+    )
+    result.update(diff)
+    result['drift'] = any(diff.values())
+    module.exit_json(**result, changed=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,17 @@ from ..module_utils.basic import default_arg_spec
 from ..module_utils.basic import default_required_if
 from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
+from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_operation
+from ..module_utils.diff import compare
+from ..module_utils.diff import to_dict
+from ..module_utils.diff import update_mask
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.serverless.functions.v1.function_pb2 import Function
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import CreateFunctionRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import DeleteFunctionRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import GetFunctionRequest
@@ -20,7 +27,7 @@ with suppress(ImportError):
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     required_if = default_required_if()
     argument_spec.update(
         {
@@ -48,8 +55,10 @@ def main() -> NoReturn:
         required_if=required_if,
         required_one_of=required_one_of,
         required_together=required_together,
+        supports_check_mode=True,
     )
-    client: FunctionServiceStub = init_sdk(module).client(FunctionServiceStub)
+    sdk = init_sdk(module)
+    client: FunctionServiceStub = sdk.client(FunctionServiceStub)
     result = {}
 
     state = module.params['state']
@@ -69,31 +78,43 @@ def main() -> NoReturn:
             if functions:
                 curr_function = functions[0]
 
-    with log_grpc_error(module):
+    desired = {'name': name, 'description': description, 'labels': labels}
+    changed = True
+    with log_error(module, ValueError), log_grpc_error(module):
         if state == 'present':
             if curr_function:
-                resp = client.Update(
-                    UpdateFunctionRequest(
-                        function_id=curr_function.id,
-                        name=name,
-                        description=description,
-                        labels=labels,
-                    ),
-                )
-                result.update(MessageToDict(resp))
+                diff = compare(curr_function, desired)
+                changed = bool(diff['after'])
+                if changed:
+                    resp = client.Update(
+                        UpdateFunctionRequest(
+                            function_id=curr_function.id,
+                            update_mask=update_mask(diff),
+                            name=name,
+                            description=description,
+                            labels=labels,
+                        ),
+                    )
+                    result.update(MessageToDict(wait_operation(module, sdk, resp)))
+                else:
+                    result['response'] = MessageToDict(curr_function)
             else:
+                diff = compare(Function(), desired)
                 resp = client.Create(
                     CreateFunctionRequest(folder_id=folder_id, name=name, description=description, labels=labels),
                 )
-                result.update(MessageToDict(resp))
+                result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
         elif state == 'absent':
             if not curr_function:
                 module.fail_json(f'function {function_id or name} not found')
+            diff = {'before': to_dict(curr_function), 'after': {}}
             resp = client.Delete(DeleteFunctionRequest(function_id=curr_function.id))
-            result.update(MessageToDict(resp))
+            result.update(MessageToDict(wait_operation(module, sdk, resp)))
 
-    module.exit_json(**result, changed=True)
+    if module._diff:
+        result['diff'] = diff
+    module.exit_json(**result, changed=changed)
 
 
 if __name__ == '__main__':
@@ -7,24 +7,23 @@ from ..module_utils.basic import default_arg_spec
 from ..module_utils.basic import default_required_if
 from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
-from ..module_utils.basic import log_error
-from ..module_utils.basic import log_grpc_error
-from ..module_utils.basic import NotFound
+from ..module_utils.basic import name_cache
+from ..module_utils.basic import wait_arg_spec
 from ..module_utils.function import get_function_id
+from ..module_utils.function import get_function_ids
+from ..module_utils.resource import apply_access_bindings
 from ..module_utils.resource import default_arg_spec as ab_default_arg_spec
+from ..module_utils.resource import default_mutually_exclusive
 from ..module_utils.resource import default_required_by
 from ..module_utils.resource import default_required_one_of
-from ..module_utils.resource import remove_access_bindings
-from ..module_utils.resource import set_access_bindings
-from ..module_utils.resource import to_ab
+from ..module_utils.resource import resolve_resource_ids
 
 with suppress(ImportError):
-    from google.protobuf.json_format import MessageToDict
     from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
 
 
 def main() -> NoReturn:
-    argument_spec = {**default_arg_spec(), **ab_default_arg_spec()}
+    argument_spec = {**default_arg_spec(), **wait_arg_spec(), **ab_default_arg_spec()}
     required_if = default_required_if()
 
     module = init_module(
@@ -32,30 +31,42 @@ def main() -> NoReturn:
         required_if=required_if,
         required_one_of=default_required_one_of(),
         required_by=default_required_by(),
+        mutually_exclusive=default_mutually_exclusive(),
         supports_check_mode=True,
     )
-    client: FunctionServiceStub = init_sdk(module).client(FunctionServiceStub)
+    sdk = init_sdk(module)
+    client: FunctionServiceStub = sdk.client(FunctionServiceStub)
     result = {}
 
-    state = module.params['state']
-    function_id = module.params['function_id']
     folder_id = module.params['folder_id']
-    name = module.params['name']
-    abs = [to_ab(ab) for ab in module.params['access_bindings']]
-
-    if not function_id:
-        with log_error(module, NotFound), log_grpc_error(module):
-            function_id = get_function_id(client, folder_id, name)
-
-    with log_grpc_error(module):
-        if state == 'present':
-            resp = set_access_bindings(client, function_id, abs)
-            result.update(MessageToDict(resp))
-        elif state == 'absent':
-            resp = remove_access_bindings(client, function_id, abs)
-            result.update(MessageToDict(resp))
-
-    module.exit_json(**result, changed=True)
+    resources = module.params['resources'] or [
+        {
+            'name': module.params['name'],
+            'resource_id': module.params['resource_id'],
+            'access_bindings': module.params['access_bindings'],
+        },
+    ]
+
+    cache = name_cache(module)
+    resolve_resource_ids(
+        module,
+        resources,
+        lambda name: get_function_id(client, folder_id, name, cache),
+        lambda: get_function_ids(client, folder_id, cache),
+    )
+    results, errors = apply_access_bindings(module, sdk, client, resources)
+
+    if module.params['resources'] is None:
+        if errors:
+            module.fail_json(msg=errors[resources[0]['resource_id']])
+        result.update(results[resources[0]['resource_id']])
+    else:
+        result['results'] = results
+        if errors:
+            module.fail_json(msg='failed to apply access bindings', errors=errors, **result)
+
+    # in reconcile mode resources that are already in the desired state have no operation
+    module.exit_json(**result, changed=any(results.values()))
 
 
 if __name__ == '__main__':
@@ -1,24 +1,31 @@
 from __future__ import annotations
 
+import itertools
 from contextlib import suppress
 from typing import Any
 from typing import Callable
 from typing import Dict
-from typing import Generator
+from typing import Iterable
 from typing import Mapping
 from typing import NoReturn
+from typing import TYPE_CHECKING
 
 from ..module_utils.basic import default_arg_spec
+from ..module_utils.basic import DEFAULT_PAGE_SIZE
 from ..module_utils.basic import default_required_if
 from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
 from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import name_cache
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import paginate
+from ..module_utils.basic import run_concurrently
 from ..module_utils.function import get_function_id
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from google.protobuf.timestamp_pb2 import Timestamp
     from yandex.cloud.access.access_pb2 import ListAccessBindingsRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionOperationsRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsVersionsRequest
@@ -27,18 +34,52 @@ with suppress(ImportError):
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListScalingPoliciesRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
 
+if TYPE_CHECKING:
+    from google.protobuf.message import Message
 
-ListResult = Dict[str, Dict[str, Any]]
+ListResult = Dict[str, Any]
 
 
-def iter_callables(
+def select_callables(
     d: Mapping[str, Callable[..., ListResult]],
     query: str,
-) -> Generator[Callable[..., ListResult], None, None]:
+) -> dict[str, Callable[..., ListResult]]:
     if d.get(query):
-        yield d[query]
+        return {query: d[query]}
+    return dict(d)
+
+
+def operations_since(
+    operations: Iterable[Message],
+    since: str | None,
+    limit: int | None = None,
+) -> tuple[list[Message], str | None]:
+    # operations are listed newest first, so paging stops at the first one the cursor has seen.
+    # since is an operation id or an RFC 3339 timestamp
+    seen_at = None
+    if since:
+        with suppress(ValueError):
+            ts = Timestamp()
+            ts.FromJsonString(since)
+            seen_at = ts.ToNanoseconds()
+
+    def seen(op: Message) -> bool:
+        if seen_at is None:
+            return op.id == since
+        return op.created_at.ToNanoseconds() <= seen_at
+
+    new = list(itertools.takewhile(lambda op: not seen(op), operations))
+    # limit keeps the oldest new operations, so the cursor never moves past one that was not returned
+    if limit is not None:
+        new = new[-limit:]
+
+    # the cursor stays behind the oldest unfinished operation, so the next call returns it again once it is done
+    pending = [i for i, op in enumerate(new) if not op.done]
+    if pending:
+        cursor = new[pending[-1] + 1].id if pending[-1] + 1 < len(new) else since
     else:
-        yield from d.values()
+        cursor = new[0].id if new else since
+    return new, cursor
 
 
 def main() -> NoReturn:
@@ -64,6 +105,10 @@ def main() -> NoReturn:
                 ],
                 'default': 'all',
             },
+            'page_size': {'type': 'int', 'default': DEFAULT_PAGE_SIZE},
+            'limit': {'type': 'int'},
+            'since': {'type': 'str'},
+            'max_workers': {'type': 'int', 'default': 6},
         },
     )
     required_one_of = [
@@ -89,6 +134,9 @@ def main() -> NoReturn:
         required_if=required_if,
         supports_check_mode=True,
     )
+    for option in ('page_size', 'limit'):
+        if module.params[option] is not None and module.params[option] < 1:
+            module.fail_json(msg=f'{option} must be a positive integer')
     client: FunctionServiceStub = init_sdk(module).client(FunctionServiceStub)
     result: dict[str, Any] = {}
 
@@ -97,41 +145,82 @@ def main() -> NoReturn:
     name = module.params['name']
     tag = module.params['tag']
     query = module.params['query']
+    page_size = module.params['page_size']
+    limit = module.params['limit']
+
+    def operations() -> ListResult:
+        since = module.params['since']
+        # with a cursor every new operation is listed up to it, limit then only applies to what is returned
+        new, cursor = operations_since(
+            paginate(
+                client.ListOperations,
+                ListFunctionOperationsRequest(function_id=function_id),
+                'operations',
+                page_size=page_size,
+                limit=None if since else limit,
+            ),
+            since,
+            limit,
+        )
+        return {'operations': [MessageToDict(op) for op in new], 'cursor': cursor}
+
+    def collect(key: str, method: Callable[[Any], Any], request: Message, field: str) -> ListResult:
+        return {key: [MessageToDict(m) for m in paginate(method, request, field, page_size=page_size, limit=limit)]}
 
     by_function_id = {
-        'versions': lambda: MessageToDict(client.ListVersions(ListFunctionsVersionsRequest(function_id=function_id))),
-        'policy': lambda: MessageToDict(
-            client.ListScalingPolicies(ListScalingPoliciesRequest(function_id=function_id)),
+        'versions': lambda: collect(
+            'versions',
+            client.ListVersions,
+            ListFunctionsVersionsRequest(function_id=function_id),
+            'versions',
         ),
-        'tags': lambda: MessageToDict(
-            client.ListTagHistory(ListFunctionTagHistoryRequest(function_id=function_id, tag=tag)),
+        'policy': lambda: collect(
+            'scalingPolicies',
+            client.ListScalingPolicies,
+            ListScalingPoliciesRequest(function_id=function_id),
+            'scaling_policies',
         ),
-        'access_bindings': lambda: MessageToDict(
-            client.ListAccessBindings(ListAccessBindingsRequest(resource_id=function_id)),
+        'tags': lambda: collect(
+            'functionTagHistoryRecords',
+            client.ListTagHistory,
+            ListFunctionTagHistoryRequest(function_id=function_id, tag=tag),
+            'function_tag_history_records',
         ),
-        'operations': lambda: MessageToDict(
-            client.ListOperations(ListFunctionOperationsRequest(function_id=function_id)),
+        'access_bindings': lambda: collect(
+            'accessBindings',
+            client.ListAccessBindings,
+            ListAccessBindingsRequest(resource_id=function_id),
+            'access_bindings',
         ),
+        'operations': operations,
         'runtimes': lambda: MessageToDict(client.ListRuntimes(ListRuntimesRequest())),
     }
 
     by_folder_id = {
-        'versions': lambda: MessageToDict(client.ListVersions(ListFunctionsVersionsRequest(folder_id=folder_id))),
+        'versions': lambda: collect(
+            'versions',
+            client.ListVersions,
+            ListFunctionsVersionsRequest(folder_id=folder_id),
+            'versions',
+        ),
         'runtimes': lambda: MessageToDict(client.ListRuntimes(ListRuntimesRequest())),
     }
 
     if not function_id and name:
         with log_error(module, NotFound), log_grpc_error(module):
-            function_id = get_function_id(client, folder_id, name)
-
-    if function_id:
-        for f in iter_callables(by_function_id, query):
-            with log_grpc_error(module):
-                result.update(f())
-    else:
-        for f in iter_callables(by_folder_id, query):
-            with log_grpc_error(module):
-                result.update(f())
+            function_id = get_function_id(client, folder_id, name, name_cache(module))
+
+    calls = select_callables(by_function_id if function_id else by_folder_id, query)
+    results, errors = run_concurrently(calls, module.params['max_workers'])
+    for r in results.values():
+        result.update(r)
+
+    if errors:
+        if not results:
+            module.fail_json(msg='; '.join(f'{q}: {e}' for q, e in errors.items()), errors=errors)
+        for q, e in errors.items():
+            module.warn(f'query {q} failed: {e}')
+        result['errors'] = errors
 
     if module.check_mode:
         result['msg'] = 'check mode set but ignored for fact gathering only'
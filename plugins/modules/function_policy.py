@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from contextlib import suppress
+from typing import Any
 from typing import NoReturn
 
 from ..module_utils.basic import default_arg_spec
@@ -9,25 +10,38 @@ from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
 from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import name_cache
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import paginate
+from ..module_utils.basic import poll_operation
+from ..module_utils.basic import run_concurrently
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_settings
+from ..module_utils.diff import compare
+from ..module_utils.diff import Diff
+from ..module_utils.diff import to_dict
+from ..module_utils.function import fill_policy
 from ..module_utils.function import get_function_id
+from ..module_utils.function import POLICY_FIELDS
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.serverless.functions.v1.function_pb2 import ScalingPolicy
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListScalingPoliciesRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import RemoveScalingPolicyRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import SetScalingPolicyRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     required_if = default_required_if()
     argument_spec.update(
         {
             'name': {'type': 'str'},
             'function_id': {'type': 'str'},
             'folder_id': {'type': 'str'},
-            'tag': {'type': 'str', 'required': True},
+            'tag': {'type': 'str'},
             'provisioned_instances_count': {'type': 'int'},
             'zone_instances_limit': {'type': 'int'},
             'zone_requests_limit': {'type': 'int'},
@@ -36,11 +50,32 @@ def main() -> NoReturn:
                 'default': 'present',
                 'choices': ['present', 'absent'],
             },
+            'policies': {
+                'type': 'list',
+                'elements': 'dict',
+                'options': {
+                    'tag': {'type': 'str', 'required': True},
+                    'provisioned_instances_count': {'type': 'int'},
+                    'zone_instances_limit': {'type': 'int'},
+                    'zone_requests_limit': {'type': 'int'},
+                    'state': {
+                        'type': 'str',
+                        'default': 'present',
+                        'choices': ['present', 'absent'],
+                    },
+                },
+            },
+            'max_workers': {'type': 'int', 'default': 10},
         },
     )
 
     required_one_of = [
         ('function_id', 'name'),
+        ('tag', 'policies'),
+    ]
+    mutually_exclusive = [
+        ('policies', 'tag'),
+        *(('policies', field) for field in POLICY_FIELDS),
     ]
     required_by = {
         'name': 'folder_id',
@@ -49,41 +84,89 @@ def main() -> NoReturn:
         argument_spec=argument_spec,
         required_if=required_if,
         required_one_of=required_one_of,
+        mutually_exclusive=mutually_exclusive,
         required_by=required_by,
+        supports_check_mode=True,
     )
-    client: FunctionServiceStub = init_sdk(module).client(FunctionServiceStub)
+    sdk = init_sdk(module)
+    client: FunctionServiceStub = sdk.client(FunctionServiceStub)
     result = {}
 
-    state = module.params['state']
     function_id = module.params['function_id']
     folder_id = module.params['folder_id']
     name = module.params['name']
-    tag = module.params['tag']
-    pi_count = module.params['provisioned_instances_count']
-    zi_limit = module.params['zone_instances_limit']
-    zr_limit = module.params['zone_requests_limit']
+    policies = module.params['policies'] or [
+        {k: module.params[k] for k in ('tag', 'state', *POLICY_FIELDS)},
+    ]
+
+    with log_error(module, NotFound), log_grpc_error(module):
+        if not function_id:
+            function_id = get_function_id(client, folder_id, name, name_cache(module))
+        # the current policies of every tag are read once for the whole task
+        current = {
+            p.tag: p
+            for p in paginate(
+                client.ListScalingPolicies,
+                ListScalingPoliciesRequest(function_id=function_id),
+                'scaling_policies',
+                page_size=1000,
+            )
+        }
+
+    policies = [fill_policy(current.get(p['tag']), p) if p['state'] == 'present' else p for p in policies]
 
-    if not function_id:
-        with log_error(module, NotFound), log_grpc_error(module):
-            function_id = get_function_id(client, folder_id, name)
+    diffs: dict[str, Diff] = {}
+    with log_error(module, ValueError):
+        for p in policies:
+            curr = current.get(p['tag'])
+            if p['state'] == 'present':
+                if curr is None:
+                    diffs[p['tag']] = compare(ScalingPolicy(), {'tag': p['tag'], **{f: p[f] for f in POLICY_FIELDS}})
+                else:
+                    diff = compare(curr, {f: p[f] for f in POLICY_FIELDS})
+                    if diff['after']:
+                        diffs[p['tag']] = diff
+            elif curr is not None:
+                diffs[p['tag']] = {'before': to_dict(curr), 'after': {}}
 
-    with log_grpc_error(module):
-        if state == 'present':
+    def apply(policy: dict[str, Any]) -> dict[str, Any]:
+        if policy['state'] == 'present':
             resp = client.SetScalingPolicy(
                 SetScalingPolicyRequest(
                     function_id=function_id,
-                    tag=tag,
-                    provisioned_instances_count=pi_count,
-                    zone_instances_limit=zi_limit,
-                    zone_requests_limit=zr_limit,
+                    tag=policy['tag'],
+                    **{f: policy[f] for f in POLICY_FIELDS},
                 ),
             )
-            result.update(MessageToDict(resp))
-        elif state == 'absent':
-            resp = client.RemoveScalingPolicy(RemoveScalingPolicyRequest(function_id=function_id, tag=tag))
-            result.update(MessageToDict(resp))
+        else:
+            resp = client.RemoveScalingPolicy(RemoveScalingPolicyRequest(function_id=function_id, tag=policy['tag']))
+        if module.params['wait']:
+            resp = poll_operation(sdk, resp, *wait_settings(module))
+        return MessageToDict(resp)
+
+    # tags whose policy already matches are left alone
+    calls = {p['tag']: (lambda p=p: apply(p)) for p in policies if p['tag'] in diffs}
+    results, errors = run_concurrently(calls, module.params['max_workers'])
+
+    if module.params['policies'] is None:
+        (tag,) = [p['tag'] for p in policies]
+        if errors:
+            module.fail_json(msg=errors[tag])
+        if tag in results:
+            result.update(results[tag])
+        elif tag in current:
+            result['response'] = MessageToDict(current[tag])
+    else:
+        result['results'] = results
+        if errors:
+            module.fail_json(msg='failed to apply scaling policies', errors=errors, **result)
 
-    module.exit_json(**result, changed=True)
+    if module._diff:
+        result['diff'] = {
+            'before': {tag: diff['before'] for tag, diff in diffs.items()},
+            'after': {tag: diff['after'] for tag, diff in diffs.items()},
+        }
+    module.exit_json(**result, changed=bool(diffs))
 
 
 if __name__ == '__main__':
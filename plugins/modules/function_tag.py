@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from contextlib import suppress
+from typing import Any
 from typing import NoReturn
+from typing import TYPE_CHECKING
 
 from ..module_utils.basic import default_arg_spec
 from ..module_utils.basic import default_required_if
@@ -9,19 +11,68 @@ from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
 from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import name_cache
 from ..module_utils.basic import NotFound
+from ..module_utils.basic import poll_operation
+from ..module_utils.basic import run_concurrently
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_settings
 from ..module_utils.function import get_function_id
-from ..module_utils.function import get_function_version_id
+from ..module_utils.function import get_function_ids
+from ..module_utils.function import get_function_version
+from ..module_utils.function import get_latest_versions
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import GetFunctionVersionRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import RemoveFunctionTagRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2 import SetFunctionTagRequest
     from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
 
+if TYPE_CHECKING:
+    from ansible.module_utils.basic import AnsibleModule
+
+
+def resolve_versions(module: AnsibleModule, client: FunctionServiceStub, entries: list[dict[str, Any]]) -> None:
+    # many entries are resolved from one listing of the folder functions and one of the folder versions,
+    # functions outside of the folder fall back to a listing of their own versions
+    unresolved = [e for e in entries if not e['function_version_id']]
+    if not unresolved:
+        return
+    folder_id = module.params['folder_id']
+    by_name = [e for e in unresolved if not e['function_id']]
+    if by_name and not folder_id:
+        module.fail_json(msg='folder_id is required to resolve functions by name')
+
+    with log_error(module, NotFound), log_grpc_error(module):
+        if len(by_name) == 1:
+            by_name[0]['function_id'] = get_function_id(client, folder_id, by_name[0]['name'], name_cache(module))
+        elif by_name:
+            ids = get_function_ids(client, folder_id, name_cache(module))
+            for e in by_name:
+                if e['name'] not in ids:
+                    raise NotFound(f'function {e["name"]} not found')
+                e['function_id'] = ids[e['name']]
+
+        latest = get_latest_versions(client, folder_id) if folder_id and len(unresolved) > 1 else {}
+
+    # resolved versions are kept on the entries, their tags tell whether a tag operation is needed
+    rest = {}
+    for e in unresolved:
+        if e['function_id'] in latest:
+            e['version'] = latest[e['function_id']]
+        else:
+            rest[e['function_id']] = lambda function_id=e['function_id']: get_function_version(client, function_id)
+    versions, errors = run_concurrently(rest, module.params['max_workers'])
+    if errors:
+        module.fail_json(msg='failed to resolve function versions', errors=errors)
+    for e in unresolved:
+        e.setdefault('version', versions.get(e['function_id']))
+        e['function_version_id'] = e['version'].id
+
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     required_if = default_required_if()
     argument_spec.update(
         {
@@ -29,17 +80,40 @@ def main() -> NoReturn:
             'function_id': {'type': 'str'},
             'folder_id': {'type': 'str'},
             'function_version_id': {'type': 'str'},
-            'tag': {'type': 'str', 'required': True},
+            'tag': {'type': 'str'},
             'state': {
                 'type': 'str',
                 'default': 'present',
                 'choices': ['present', 'absent'],
             },
+            'tags': {
+                'type': 'list',
+                'elements': 'dict',
+                'options': {
+                    'name': {'type': 'str'},
+                    'function_id': {'type': 'str'},
+                    'function_version_id': {'type': 'str'},
+                    'tag': {'type': 'str', 'required': True},
+                    'state': {
+                        'type': 'str',
+                        'default': 'present',
+                        'choices': ['present', 'absent'],
+                    },
+                },
+                'required_one_of': [('function_version_id', 'function_id', 'name')],
+            },
+            'max_workers': {'type': 'int', 'default': 10},
         },
     )
 
     required_one_of = [
-        ('function_version_id', 'function_id', 'name'),
+        ('tag', 'tags'),
+    ]
+    mutually_exclusive = [
+        ('tags', 'tag'),
+        ('tags', 'name'),
+        ('tags', 'function_id'),
+        ('tags', 'function_version_id'),
     ]
     required_by = {
         'name': 'folder_id',
@@ -48,34 +122,59 @@ def main() -> NoReturn:
         argument_spec=argument_spec,
         required_if=required_if,
         required_one_of=required_one_of,
+        mutually_exclusive=mutually_exclusive,
         required_by=required_by,
+        supports_check_mode=True,
     )
-    client: FunctionServiceStub = init_sdk(module).client(FunctionServiceStub)
+    sdk = init_sdk(module)
+    client: FunctionServiceStub = sdk.client(FunctionServiceStub)
     result = {}
 
-    state = module.params['state']
-    function_id = module.params['function_id']
-    folder_id = module.params['folder_id']
-    name = module.params['name']
-    tag = module.params['tag']
-    function_version_id = module.params['function_version_id']
-
-    if not function_version_id:
-        with log_error(module, NotFound), log_grpc_error(module):
-            if not function_id:
-                function_id = get_function_id(client, folder_id, name)
-            function_version_id = get_function_version_id(client, function_id)
-
-    with log_grpc_error(module):
-        if state == 'present':
-            resp = client.SetTag(SetFunctionTagRequest(function_version_id=function_version_id, tag=tag))
-            result.update(MessageToDict(resp))
-
-        elif state == 'absent':
-            resp = client.RemoveTag(RemoveFunctionTagRequest(function_version_id=function_version_id, tag=tag))
-            result.update(MessageToDict(resp))
-
-    module.exit_json(**result, changed=True)
+    entries = module.params['tags']
+    if entries is None:
+        if not any(module.params[k] for k in ('function_version_id', 'function_id', 'name')):
+            module.fail_json(msg='one of the following is required: function_version_id, function_id, name')
+        entries = [
+            {k: module.params[k] for k in ('name', 'function_id', 'function_version_id', 'tag', 'state')},
+        ]
+    resolve_versions(module, client, entries)
+
+    def apply(entry: dict[str, Any]) -> dict[str, Any]:
+        version = entry.get('version') or client.GetVersion(
+            GetFunctionVersionRequest(function_version_id=entry['function_version_id']),
+        )
+        # a tag belongs to one version of a function, setting it on the version that has it changes nothing
+        if (entry['tag'] in version.tags) == (entry['state'] == 'present'):
+            return {}
+
+        if entry['state'] == 'present':
+            resp = client.SetTag(
+                SetFunctionTagRequest(function_version_id=entry['function_version_id'], tag=entry['tag']),
+            )
+        else:
+            resp = client.RemoveTag(
+                RemoveFunctionTagRequest(function_version_id=entry['function_version_id'], tag=entry['tag']),
+            )
+        # operations are sent together and each worker waits for its own, so the waits overlap
+        if module.params['wait']:
+            resp = poll_operation(sdk, resp, *wait_settings(module))
+        return MessageToDict(resp)
+
+    calls = {f'{e["function_version_id"]}/{e["tag"]}': (lambda e=e: apply(e)) for e in entries}
+    results, errors = run_concurrently(calls, module.params['max_workers'])
+
+    if module.params['tags'] is None:
+        (key,) = calls
+        if errors:
+            module.fail_json(msg=errors[key])
+        result.update(results[key])
+    else:
+        result['results'] = results
+        if errors:
+            module.fail_json(msg='failed to apply tags', errors=errors, **result)
+
+    # entries already in the desired state have no operation
+    module.exit_json(**result, changed=any(results.values()))
 
 
 if __name__ == '__main__':
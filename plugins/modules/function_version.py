@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import zipfile
+from contextlib import ExitStack
 from contextlib import suppress
 from typing import NoReturn
 
@@ -10,9 +11,16 @@ from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
 from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import name_cache
 from ..module_utils.basic import NotFound
-from ..module_utils.basic import validate_zip
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_operation
+from ..module_utils.function import content_tag
 from ..module_utils.function import get_function_id
+from ..module_utils.function import get_latest_version
+from ..module_utils.function import is_deployed
+from ..module_utils.function import open_archive
+from ..module_utils.package import build_package
 
 with suppress(ImportError):
     from google.protobuf.duration_pb2 import Duration
@@ -22,7 +30,7 @@ with suppress(ImportError):
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     required_if = default_required_if()
     argument_spec.update(
         {
@@ -50,6 +58,8 @@ def main() -> NoReturn:
                 },
             },
             'content': {'type': 'str'},
+            'source_dir': {'type': 'path'},
+            'validate_crc': {'type': 'bool', 'default': False},
             'version_id': {'type': 'str'},
             'environment': {'type': 'dict', 'elements': 'str'},
             'tag': {'type': 'list', 'elements': 'str'},
@@ -76,7 +86,10 @@ def main() -> NoReturn:
 
     required_one_of = [
         ('function_id', 'name'),
-        ('package', 'content', 'version_id'),
+        ('package', 'content', 'source_dir', 'version_id'),
+    ]
+    mutually_exclusive = [
+        ('content', 'source_dir'),
     ]
     required_by = {
         'name': 'folder_id',
@@ -86,9 +99,11 @@ def main() -> NoReturn:
         required_if=required_if,
         required_one_of=required_one_of,
         required_by=required_by,
+        mutually_exclusive=mutually_exclusive,
         supports_check_mode=True,
     )
-    client: FunctionServiceStub = init_sdk(module).client(FunctionServiceStub)
+    sdk = init_sdk(module)
+    client: FunctionServiceStub = sdk.client(FunctionServiceStub)
     result = {}
 
     function_id = module.params['function_id']
@@ -96,6 +111,7 @@ def main() -> NoReturn:
     name = module.params['name']
     package = module.params['package']
     content = module.params['content']
+    source_dir = module.params['source_dir']
     version_id = module.params['version_id']
     kw = {
         'runtime': module.params['runtime'],
@@ -117,22 +133,40 @@ def main() -> NoReturn:
 
     if not function_id:
         with log_error(module, NotFound), log_grpc_error(module):
-            function_id = get_function_id(client, folder_id, name)
+            function_id = get_function_id(client, folder_id, name, name_cache(module))
     kw['function_id'] = function_id
 
-    if package:
-        kw['package'] = package
-    elif content:
-        with log_error(module, FileNotFoundError, zipfile.BadZipfile):
-            validate_zip(module, module.params['content'])
-        with log_error(module, FileNotFoundError), open(content, 'rb') as f:
-            kw['content'] = f.read()
-    elif version_id:
-        kw['version_id'] = version_id
-
-    with log_grpc_error(module):
-        resp = client.CreateVersion(CreateFunctionVersionRequest(**kw))
-        result['CreateFunctionVersion'] = MessageToDict(resp)
+    if source_dir:
+        with log_error(module, OSError):
+            content = build_package(source_dir, module.params['cache_dir'])
+
+    with ExitStack() as stack:
+        archive = None
+        sha256 = None
+        if package:
+            kw['package'] = package
+            sha256 = package['sha256']
+        elif content:
+            with log_error(module, OSError, ValueError, zipfile.BadZipFile):
+                archive, sha256 = stack.enter_context(open_archive(content, crc=module.params['validate_crc']))
+        elif version_id:
+            kw['version_id'] = version_id
+
+        if sha256:
+            kw['tag'] = [*(kw['tag'] or []), content_tag(sha256)]
+            with log_grpc_error(module):
+                latest = get_latest_version(client, function_id)
+            with log_error(module, ValueError):
+                deployed = is_deployed(latest, kw, module.params['execution_timeout'])
+            if deployed:
+                module.exit_json(**result, version_id=latest.id, changed=False)
+
+        if archive is not None:
+            kw['content'] = archive[:]
+
+        with log_grpc_error(module):
+            resp = client.CreateVersion(CreateFunctionVersionRequest(**kw))
+            result['CreateFunctionVersion'] = MessageToDict(wait_operation(module, sdk, resp))
 
     module.exit_json(**result, changed=True)
 
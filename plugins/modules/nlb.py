@@ -7,10 +7,18 @@ from ..module_utils.basic import default_arg_spec
 from ..module_utils.basic import default_required_if
 from ..module_utils.basic import init_module
 from ..module_utils.basic import init_sdk
+from ..module_utils.basic import log_error
 from ..module_utils.basic import log_grpc_error
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_operation
+from ..module_utils.diff import compare
+from ..module_utils.diff import to_dict
+from ..module_utils.diff import update_mask
+from ..module_utils.nlb import listener_from_spec
 
 with suppress(ImportError):
     from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.loadbalancer.v1.network_load_balancer_pb2 import NetworkLoadBalancer
     from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import CreateNetworkLoadBalancerRequest
     from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import DeleteNetworkLoadBalancerRequest
     from yandex.cloud.loadbalancer.v1.network_load_balancer_service_pb2 import GetNetworkLoadBalancerRequest
@@ -20,7 +28,7 @@ with suppress(ImportError):
 
 
 def main() -> NoReturn:
-    argument_spec = default_arg_spec()
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
     argument_spec.update(
         {
             'folder_id': {'type': 'str'},
@@ -110,7 +118,8 @@ def main() -> NoReturn:
         mutually_exclusive=mutually_exclusive,
         supports_check_mode=True,
     )
-    client: NetworkLoadBalancerServiceStub = init_sdk(module).client(NetworkLoadBalancerServiceStub)
+    sdk = init_sdk(module)
+    client: NetworkLoadBalancerServiceStub = sdk.client(NetworkLoadBalancerServiceStub)
     result = {}
 
     state = module.params['state']
@@ -125,7 +134,7 @@ def main() -> NoReturn:
     attached_target_groups = module.params['attached_target_groups']
     if attached_target_groups:
         for g in attached_target_groups:
-            if len(g.health_checks) != 1:
+            if len(g['health_checks'] or []) != 1:
                 module.fail_json('health_checks: the number of elements must be exactly 1')
 
     curr_nlb = None
@@ -139,24 +148,40 @@ def main() -> NoReturn:
             if nlbs:
                 curr_nlb = nlbs[0]
 
-    with log_grpc_error(module):
+    desired = {
+        'name': name,
+        'description': description,
+        'labels': labels,
+        'listeners': [listener_from_spec(spec) for spec in listener_specs] if listener_specs is not None else None,
+        'attached_target_groups': attached_target_groups,
+    }
+    changed = True
+    with log_error(module, ValueError), log_grpc_error(module):
         if state == 'present':
             if curr_nlb:
-                resp = client.Update(
-                    UpdateNetworkLoadBalancerRequest(
-                        network_load_balancer_id=curr_nlb.id,
-                        name=name,
-                        description=description,
-                        labels=labels,
-                        listener_specs=listener_specs,
-                        attached_target_groups=attached_target_groups,
-                    ),
-                )
-                result.update(MessageToDict(resp))
+                diff = compare(curr_nlb, desired)
+                changed = bool(diff['after'])
+                if changed:
+                    resp = client.Update(
+                        UpdateNetworkLoadBalancerRequest(
+                            network_load_balancer_id=curr_nlb.id,
+                            update_mask=update_mask(diff, {'listeners': 'listener_specs'}),
+                            name=name,
+                            description=description,
+                            labels=labels,
+                            listener_specs=listener_specs,
+                            attached_target_groups=attached_target_groups,
+                        ),
+                    )
+                    result.update(MessageToDict(wait_operation(module, sdk, resp)))
+                else:
+                    result['response'] = MessageToDict(curr_nlb)
             else:
+                diff = compare(NetworkLoadBalancer(), desired)
                 resp = client.Create(
                     CreateNetworkLoadBalancerRequest(
                         folder_id=folder_id,
+                        name=name,
                         description=description,
                         labels=labels,
                         region_id=region_id,
@@ -165,13 +190,17 @@ def main() -> NoReturn:
                         attached_target_groups=attached_target_groups,
                     ),
                 )
-                result.update(MessageToDict(resp))
+                result.update(MessageToDict(wait_operation(module, sdk, resp)))
         elif state == 'absent':
             if not curr_nlb:
                 module.fail_json(f'networkloadbalancer {nlb_id or name} not found')
+            diff = {'before': to_dict(curr_nlb), 'after': {}}
             resp = client.Delete(DeleteNetworkLoadBalancerRequest(network_load_balancer_id=curr_nlb.id))
-            result.update(MessageToDict(resp))
-    module.exit_json(**result, changed=True)
+            result.update(MessageToDict(wait_operation(module, sdk, resp)))
+
+    if module._diff:
+        result['diff'] = diff
+    module.exit_json(**result, changed=changed)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+import re
+import threading
+from contextlib import suppress
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import NoReturn
+from typing import TYPE_CHECKING
+
+from ..module_utils.basic import default_arg_spec
+from ..module_utils.basic import default_required_if
+from ..module_utils.basic import init_module
+from ..module_utils.basic import init_sdk
+from ..module_utils.basic import paginate
+from ..module_utils.basic import poll_operation
+from ..module_utils.basic import run_concurrently
+from ..module_utils.basic import run_graph
+from ..module_utils.basic import wait_arg_spec
+from ..module_utils.basic import wait_settings
+from ..module_utils.diff import compare
+from ..module_utils.diff import update_mask
+from ..module_utils.function import content_tag
+from ..module_utils.function import fill_policy
+from ..module_utils.function import get_latest_versions
+from ..module_utils.function import is_deployed
+from ..module_utils.function import open_archive
+from ..module_utils.function import POLICY_FIELDS
+from ..module_utils.function import VERSION_FIELDS
+from ..module_utils.package import build_package
+
+with suppress(ImportError):
+    from google.protobuf.duration_pb2 import Duration
+    from google.protobuf.json_format import MessageToDict
+    from yandex.cloud.dns.v1.dns_zone_pb2 import DnsZone
+    from yandex.cloud.dns.v1.dns_zone_service_pb2 import CreateDnsZoneMetadata
+    from yandex.cloud.dns.v1.dns_zone_service_pb2 import CreateDnsZoneRequest
+    from yandex.cloud.dns.v1.dns_zone_service_pb2 import ListDnsZonesRequest
+    from yandex.cloud.dns.v1.dns_zone_service_pb2 import UpdateDnsZoneRequest
+    from yandex.cloud.dns.v1.dns_zone_service_pb2_grpc import DnsZoneServiceStub
+    from yandex.cloud.serverless.apigateway.v1.apigateway_pb2 import ApiGateway
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import AddDomainRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import CreateApiGatewayMetadata
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import CreateApiGatewayRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import GetOpenapiSpecRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import ListApiGatewayRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import RemoveDomainRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2 import UpdateApiGatewayRequest
+    from yandex.cloud.serverless.apigateway.v1.apigateway_service_pb2_grpc import ApiGatewayServiceStub
+    from yandex.cloud.serverless.functions.v1.function_pb2 import Function
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import CreateFunctionMetadata
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import CreateFunctionRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import CreateFunctionVersionMetadata
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import CreateFunctionVersionRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListFunctionsRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import ListScalingPoliciesRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import SetScalingPolicyRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2 import UpdateFunctionRequest
+    from yandex.cloud.serverless.functions.v1.function_service_pb2_grpc import FunctionServiceStub
+
+if TYPE_CHECKING:
+    from ansible.module_utils.basic import AnsibleModule
+    from google.protobuf.message import Message
+    from yandex.cloud.operation.operation_pb2 import Operation
+
+    from ..module_utils.sdk import SDK
+
+# references to the ids of stack functions in openapi specs, resolved once the function exists
+FUNCTION_REF = re.compile(r'\$\{functions\.([^.}]+)\.id\}')
+NodeResult = Dict[str, Any]
+
+
+def created_id(operation: Operation, metadata: type[Message], field: str) -> str | None:
+    # ids of created resources are in the operation metadata right away, check mode operations have none
+    meta = metadata()
+    if not operation.metadata.Unpack(meta):
+        return None
+    return getattr(meta, field) or None
+
+
+class Stack:
+    # every method is one node of the graph, it reads the state of the read phase and the results of the nodes
+    # it depends on, and waits for its operation only when other nodes depend on it
+    def __init__(self, module: AnsibleModule, sdk: SDK) -> None:
+        self.module = module
+        self.sdk = sdk
+        self.folder_id = module.params['folder_id']
+        self.functions: FunctionServiceStub = sdk.client(FunctionServiceStub)
+        self.api_gateways: ApiGatewayServiceStub = sdk.client(ApiGatewayServiceStub)
+        self.dns_zones: DnsZoneServiceStub = sdk.client(DnsZoneServiceStub)
+        self.current: dict[str, Any] = {}
+        self.results: dict[str, NodeResult] = {}
+        self.operations: dict[str, Operation] = {}
+        self._lock = threading.Lock()
+
+    def read(self) -> dict[str, str]:
+        # one listing per resource kind, then the per resource state the listings don't carry
+        folder_id = self.folder_id
+        listed, errors = run_concurrently(
+            {
+                'functions': lambda: {
+                    f.name: f
+                    for f in paginate(
+                        self.functions.List,
+                        ListFunctionsRequest(folder_id=folder_id),
+                        'functions',
+                        page_size=1000,
+                    )
+                },
+                'versions': lambda: get_latest_versions(self.functions, folder_id),
+                'api_gateways': lambda: {
+                    ag.name: ag
+                    for ag in paginate(
+                        self.api_gateways.List,
+                        ListApiGatewayRequest(folder_id=folder_id),
+                        'api_gateways',
+                        page_size=1000,
+                    )
+                },
+                'dns_zones': lambda: {
+                    z.name: z
+                    for z in paginate(
+                        self.dns_zones.List,
+                        ListDnsZonesRequest(folder_id=folder_id),
+                        'dns_zones',
+                        page_size=1000,
+                    )
+                },
+            },
+            self.module.params['max_workers'],
+        )
+        if errors:
+            return errors
+        self.current.update(listed)
+
+        calls: dict[str, Callable[[], Any]] = {}
+        for spec in self.module.params['functions']:
+            curr = listed['functions'].get(spec['name'])
+            if curr is not None and spec['policies']:
+                calls[f'policies/{spec["name"]}'] = lambda function_id=curr.id: {
+                    p.tag: p
+                    for p in paginate(
+                        self.functions.ListScalingPolicies,
+                        ListScalingPoliciesRequest(function_id=function_id),
+                        'scaling_policies',
+                        page_size=1000,
+                    )
+                }
+        for spec in self.module.params['api_gateways']:
+            curr = listed['api_gateways'].get(spec['name'])
+            if curr is not None:
+                request = GetOpenapiSpecRequest(api_gateway_id=curr.id)
+                calls[f'openapi_spec/{spec["name"]}'] = (
+                    lambda request=request: self.api_gateways.GetOpenapiSpec(request).openapi_spec
+                )
+        details, errors = run_concurrently(calls, self.module.params['max_workers'])
+        self.current.update(details)
+        return errors
+
+    def finish(self, key: str, operation: Operation, dependents: bool) -> Operation:
+        if dependents:
+            return poll_operation(self.sdk, operation, *wait_settings(self.module))
+        with self._lock:
+            self.operations[key] = operation
+        return operation
+
+    def function(self, key: str, spec: dict[str, Any], dependents: bool) -> NodeResult:
+        curr = self.current['functions'].get(spec['name'])
+        desired = {'name': spec['name'], 'description': spec['description'], 'labels': spec['labels']}
+        if curr is None:
+            diff = compare(Function(), desired)
+            op = self.functions.Create(CreateFunctionRequest(folder_id=self.folder_id, **desired))
+            self.finish(key, op, dependents)
+            return {'id': created_id(op, CreateFunctionMetadata, 'function_id'), 'changed': True, 'diff': diff}
+
+        diff = compare(curr, desired)
+        if diff['after']:
+            op = self.functions.Update(
+                UpdateFunctionRequest(function_id=curr.id, update_mask=update_mask(diff), **desired),
+            )
+            self.finish(key, op, dependents)
+        return {'id': curr.id, 'changed': bool(diff['after']), 'diff': diff}
+
+    def version(self, key: str, spec: dict[str, Any], function_key: str, dependents: bool) -> NodeResult:
+        version = spec['version']
+        function_id = self.results[function_key]['id']
+        content = version['content']
+        if version['source_dir']:
+            content = build_package(version['source_dir'], self.module.params['cache_dir'])
+        with open_archive(content, crc=version['validate_crc']) as (archive, sha256):
+            kw = {field: version.get(field) for field in VERSION_FIELDS}
+            kw['tag'] = [*(version['tags'] or []), content_tag(sha256)]
+            execution_timeout = Duration()
+            execution_timeout.FromJsonString(version['execution_timeout'])
+
+            latest = self.current['versions'].get(function_id)
+            if is_deployed(latest, kw, version['execution_timeout']):
+                return {'id': latest.id, 'changed': False}
+
+            op = self.functions.CreateVersion(
+                CreateFunctionVersionRequest(
+                    function_id=function_id,
+                    execution_timeout=execution_timeout,
+                    content=archive[:],
+                    **kw,
+                ),
+            )
+        self.finish(key, op, dependents)
+        return {'id': created_id(op, CreateFunctionVersionMetadata, 'function_version_id'), 'changed': True}
+
+    def policy(self, key: str, spec: dict[str, Any], policy: dict[str, Any], function_key: str) -> NodeResult:
+        curr = self.current.get(f'policies/{spec["name"]}', {}).get(policy['tag'])
+        filled = fill_policy(curr, policy)
+        desired = {field: filled[field] for field in POLICY_FIELDS}
+        if curr is not None and not compare(curr, desired)['after']:
+            return {'changed': False}
+        op = self.functions.SetScalingPolicy(
+            SetScalingPolicyRequest(function_id=self.results[function_key]['id'], tag=policy['tag'], **desired),
+        )
+        self.finish(key, op, False)
+        return {'changed': True}
+
+    def api_gateway(self, key: str, spec: dict[str, Any], dependents: bool) -> NodeResult:
+        with open(spec['openapi_spec'], encoding='utf-8') as f:
+            openapi_spec = FUNCTION_REF.sub(lambda m: self.function_id(m.group(1)), f.read())
+        curr = self.current['api_gateways'].get(spec['name'])
+        desired = {'name': spec['name'], 'description': spec['description'], 'labels': spec['labels']}
+
+        if curr is None:
+            diff = compare(ApiGateway(), desired)
+            diff['after']['openapi_spec'] = openapi_spec
+            op = self.api_gateways.Create(
+                CreateApiGatewayRequest(folder_id=self.folder_id, openapi_spec=openapi_spec, **desired),
+            )
+            # domains are attached to the created gateway, so it has to exist first
+            self.finish(key, op, dependents or bool(spec['domains']))
+            api_gateway_id = created_id(op, CreateApiGatewayMetadata, 'api_gateway_id')
+            attached = set()
+        else:
+            diff = compare(curr, desired)
+            curr_spec = self.current[f'openapi_spec/{spec["name"]}']
+            if curr_spec.strip() != openapi_spec.strip():
+                diff['before']['openapi_spec'] = curr_spec
+                diff['after']['openapi_spec'] = openapi_spec
+            if diff['after']:
+                op = self.api_gateways.Update(
+                    UpdateApiGatewayRequest(
+                        api_gateway_id=curr.id,
+                        update_mask=update_mask(diff),
+                        openapi_spec=openapi_spec,
+                        **desired,
+                    ),
+                )
+                self.finish(key, op, dependents)
+            api_gateway_id = curr.id
+            attached = {d.domain_id for d in curr.attached_domains}
+
+        # domains are reconciled like the other fields: left alone when not set, otherwise the list is exact
+        domains = spec['domains']
+        added = [d for d in domains or [] if d not in attached]
+        removed = sorted(attached - set(domains)) if domains is not None else []
+        for domain_id in added:
+            op = self.api_gateways.AddDomain(AddDomainRequest(api_gateway_id=api_gateway_id, domain_id=domain_id))
+            self.finish(f'{key}/domain/{domain_id}', op, False)
+        for domain_id in removed:
+            op = self.api_gateways.RemoveDomain(
+                RemoveDomainRequest(api_gateway_id=api_gateway_id, domain_id=domain_id),
+            )
+            self.finish(f'{key}/domain/{domain_id}', op, False)
+        if added or removed:
+            diff['before']['domains'] = sorted(attached)
+            diff['after']['domains'] = sorted(attached - set(removed) | set(added))
+        return {'id': api_gateway_id, 'changed': bool(diff['after']), 'diff': diff}
+
+    def dns_zone(self, key: str, spec: dict[str, Any]) -> NodeResult:
+        curr = self.current['dns_zones'].get(spec['name'])
+        desired = {'name': spec['name'], 'description': spec['description'], 'labels': spec['labels']}
+        if spec['network_ids']:
+            desired['private_visibility'] = {'network_ids': spec['network_ids']}
+        else:
+            desired['public_visibility'] = {}
+
+        if curr is None:
+            diff = compare(DnsZone(), {**desired, 'zone': spec['zone']})
+            op = self.dns_zones.Create(CreateDnsZoneRequest(folder_id=self.folder_id, zone=spec['zone'], **desired))
+            self.finish(key, op, False)
+            return {'id': created_id(op, CreateDnsZoneMetadata, 'dns_zone_id'), 'changed': True, 'diff': diff}
+
+        diff = compare(curr, desired)
+        if diff['after']:
+            op = self.dns_zones.Update(
+                UpdateDnsZoneRequest(dns_zone_id=curr.id, update_mask=update_mask(diff), **desired),
+            )
+            self.finish(key, op, False)
+        return {'id': curr.id, 'changed': bool(diff['after']), 'diff': diff}
+
+    def function_id(self, name: str) -> str:
+        result = self.results.get(f'function/{name}')
+        if result is not None:
+            return result['id'] or f'<id of function {name}>'
+        return self.current['functions'][name].id
+
+    def graph(self) -> dict[str, tuple[list[str], Callable[[], NodeResult]]]:
+        nodes: dict[str, tuple[list[str], Callable[[], NodeResult]]] = {}
+        dependents: set[str] = set()
+
+        def node(key: str, deps: list[str], call: Callable[[bool], NodeResult]) -> None:
+            dependents.update(deps)
+            # dependents are known once the whole graph is built, which happens before any node runs
+            nodes[key] = (deps, lambda: self._record(key, call(key in dependents)))
+
+        stack_functions = {spec['name'] for spec in self.module.params['functions']}
+        for spec in self.module.params['functions']:
+            fkey = f'function/{spec["name"]}'
+            node(fkey, [], lambda d, k=fkey, s=spec: self.function(k, s, d))
+            after = fkey
+            if spec['version']:
+                vkey = f'version/{spec["name"]}'
+                node(vkey, [fkey], lambda d, k=vkey, s=spec, f=fkey: self.version(k, s, f, d))
+                after = vkey
+            for policy in spec['policies'] or []:
+                pkey = f'policy/{spec["name"]}/{policy["tag"]}'
+                node(pkey, [after], lambda d, k=pkey, s=spec, p=policy, f=fkey: self.policy(k, s, p, f))
+
+        for spec in self.module.params['api_gateways']:
+            with open(spec['openapi_spec'], encoding='utf-8') as f:
+                refs = set(FUNCTION_REF.findall(f.read()))
+            unknown = sorted(refs - stack_functions - set(self.current['functions']))
+            if unknown:
+                raise ValueError(f'api gateway {spec["name"]} references unknown functions {", ".join(unknown)}')
+            # only functions of the stack are waited for, the others already exist
+            deps = [f'function/{name}' for name in sorted(refs & stack_functions)]
+            key = f'api_gateway/{spec["name"]}'
+            node(key, deps, lambda d, k=key, s=spec: self.api_gateway(k, s, d))
+
+        for spec in self.module.params['dns_zones']:
+            key = f'dns_zone/{spec["name"]}'
+            node(key, [], lambda d, k=key, s=spec: self.dns_zone(k, s))
+        return nodes
+
+    def _record(self, key: str, result: NodeResult) -> NodeResult:
+        self.results[key] = result
+        return result
+
+
+def main() -> NoReturn:
+    argument_spec = {**default_arg_spec(), **wait_arg_spec()}
+    required_if = default_required_if()
+    version = {
+        'type': 'dict',
+        'options': {
+            'runtime': {'type': 'str', 'required': True},
+            'entrypoint': {'type': 'str', 'required': True},
+            'resources': {
+                'type': 'dict',
+                'required': True,
+                'options': {
+                    'memory': {'type': 'int', 'required': True},
+                },
+            },
+            'execution_timeout': {'type': 'str', 'required': True},
+            'service_account_id': {'type': 'str'},
+            'description': {'type': 'str'},
+            'environment': {'type': 'dict'},
+            'tags': {'type': 'list', 'elements': 'str'},
+            'content': {'type': 'path'},
+            'source_dir': {'type': 'path'},
+            'validate_crc': {'type': 'bool', 'default': False},
+        },
+        'required_one_of': [('content', 'source_dir')],
+        'mutually_exclusive': [('content', 'source_dir')],
+    }
+    argument_spec.update(
+        {
+            'folder_id': {'type': 'str', 'required': True},
+            'functions': {
+                'type': 'list',
+                'elements': 'dict',
+                'default': [],
+                'options': {
+                    'name': {'type': 'str', 'required': True},
+                    'description': {'type': 'str'},
+                    'labels': {'type': 'dict'},
+                    'version': version,
+                    'policies': {
+                        'type': 'list',
+                        'elements': 'dict',
+                        'options': {
+                            'tag': {'type': 'str', 'required': True},
+                            'provisioned_instances_count': {'type': 'int'},
+                            'zone_instances_limit': {'type': 'int'},
+                            'zone_requests_limit': {'type': 'int'},
+                        },
+                    },
+                },
+            },
+            'api_gateways': {
+                'type': 'list',
+                'elements': 'dict',
+                'default': [],
+                'options': {
+                    'name': {'type': 'str', 'required': True},
+                    'description': {'type': 'str'},
+                    'labels': {'type': 'dict'},
+                    'openapi_spec': {'type': 'path', 'required': True},
+                    'domains': {'type': 'list', 'elements': 'str'},
+                },
+            },
+            'dns_zones': {
+                'type': 'list',
+                'elements': 'dict',
+                'default': [],
+                'options': {
+                    'name': {'type': 'str', 'required': True},
+                    'zone': {'type': 'str', 'required': True},
+                    'description': {'type': 'str'},
+                    'labels': {'type': 'dict'},
+                    'network_ids': {'type': 'list', 'elements': 'str'},
+                },
+            },
+            'max_workers': {'type': 'int', 'default': 10},
+        },
+    )
+    module = init_module(
+        argument_spec=argument_spec,
+        required_if=required_if,
+        supports_check_mode=True,
+    )
+    stack = Stack(module, init_sdk(module))
+    result: dict[str, Any] = {}
+
+    errors = stack.read()
+    if errors:
+        module.fail_json(msg='failed to read the current state', errors=errors)
+    try:
+        graph = stack.graph()
+    except (ValueError, OSError) as e:
+        module.fail_json(msg=str(e))
+    results, errors = run_graph(graph, module.params['max_workers'])
+
+    # operations nothing depends on are waited for together at the end
+    if module.params['wait'] and stack.operations:
+        _, wait_errors = run_concurrently(
+            {
+                key: (lambda op=op: poll_operation(stack.sdk, op, *wait_settings(module)))
+                for key, op in stack.operations.items()
+            },
+            module.params['max_workers'],
+        )
+        errors.update(wait_errors)
+
+    result['resources'] = {
+        key: {k: v for k, v in r.items() if k != 'diff' or module._diff} for key, r in results.items()
+    }
+    result['operations'] = {key: MessageToDict(op) for key, op in stack.operations.items()}
+    changed = any(r['changed'] for r in results.values())
+    if errors:
+        module.fail_json(msg='failed to apply the stack', errors=errors, changed=changed, **result)
+    module.exit_json(**result, changed=changed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import importlib
+import io
+import json
+from contextlib import redirect_stdout
+from typing import Any
+
+from ansible.errors import AnsibleActionFail
+from ansible.module_utils import basic
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.plugins.action.normal import ActionModule as NormalAction
+
+# loaded by the controller together with the action plugin, so forked workers inherit grpc and the sdk imports
+from ..module_utils import basic as yc_basic  # noqa: F401
+
+try:
+    from ansible.module_utils.common.json import Direction
+    from ansible.module_utils.common.json import get_module_encoder
+except ImportError:  # ansible-core < 2.19
+    from ansible.module_utils.common.json import AnsibleJSONEncoder as ModuleArgsEncoder
+
+    PROFILE = None
+else:
+    PROFILE = 'legacy'
+    ModuleArgsEncoder = get_module_encoder(PROFILE, Direction.CONTROLLER_TO_MODULE)
+
+CONTROLLER_VAR = 'yandexcloud_on_controller'
+
+
+def run_module(module_name: str, module_args: dict[str, Any]) -> dict[str, Any]:
+    # runs the module main() in this process the way ansiballz would run it on the target
+    module = importlib.import_module(f'{__package__.rpartition(".")[0]}.modules.{module_name}')
+    basic._ANSIBLE_ARGS = json.dumps({'ANSIBLE_MODULE_ARGS': module_args}, cls=ModuleArgsEncoder).encode()
+    basic._ANSIBLE_PROFILE = PROFILE  # type: ignore[attr-defined]
+
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        try:
+            module.main()
+        except SystemExit:
+            pass
+    return json.loads(stdout.getvalue())
+
+
+class ControllerAction(NormalAction):
+    # api modules don't need anything from the target, with `yandexcloud_on_controller: true`
+    # they run inside the controller worker instead of being shipped to the host.
+    # Otherwise the task goes the normal way, with async and the remote tmpdir handled by the normal action
+    def run(self, tmp: str | None = None, task_vars: dict[str, Any] | None = None) -> dict[str, Any]:
+        task_vars = task_vars or {}
+        if not boolean(task_vars.get(CONTROLLER_VAR, False), strict=False):
+            return super().run(tmp, task_vars)
+
+        if self._task.async_val:
+            raise AnsibleActionFail(f'async is not supported with {CONTROLLER_VAR}')
+        result = ActionBase.run(self, tmp, task_vars)
+        module_name = self._task.action.rpartition('.')[2]
+        module_args = self._task.args.copy()
+        self._update_module_args(module_name, module_args, task_vars)
+        result.update(run_module(module_name, module_args))
+        return result
@@ -0,0 +1,76 @@
+"""Cold-start import time of every module of the collection, measured with python -X importtime.
+
+Each module is imported in a fresh interpreter the way ansiballz runs it, the run with the lowest
+total is kept. Run from the repository root:
+
+    python tools/importtime.py [--runs 5] [--top 10] [--json] [module ...]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = 'ansible_collections.q0w.yandexcloud'
+
+
+def parse(stderr: str) -> list[tuple[str, int, int]]:
+    # "import time:  self [us] | cumulative | imported package"
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:') :].split('|')
+        imports.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(collections_dir: str, module: str) -> dict[str, Any]:
+    env = {**os.environ, 'PYTHONPATH': collections_dir, 'PYTHONDONTWRITEBYTECODE': '1'}
+    name = f'{PACKAGE}.plugins.modules.{module}'
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {name}'],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f'{module}: {proc.stderr.strip().splitlines()[-1]}')
+    imports = parse(proc.stderr)
+    total = next(cumulative for n, _, cumulative in imports if n.strip() == name)
+    return {'module': module, 'total_us': total, 'imports': imports}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to show for each module')
+    parser.add_argument('--json', action='store_true', help='print one json object per module')
+    args = parser.parse_args()
+
+    modules = args.modules or sorted(
+        f[:-3] for f in os.listdir(os.path.join(ROOT, 'plugins', 'modules')) if f.endswith('.py') and f != '__init__.py'
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'ansible_collections', 'q0w'))
+        os.symlink(ROOT, os.path.join(tmp, 'ansible_collections', 'q0w', 'yandexcloud'))
+        for module in modules:
+            result = min((measure(tmp, module) for _ in range(args.runs)), key=lambda r: r['total_us'])
+            top = sorted(result['imports'], key=lambda i: i[1], reverse=True)[: args.top]
+            if args.json:
+                print(json.dumps({'module': module, 'total_us': result['total_us'], 'top': top}))
+                continue
+            print(f'{module:<28} {result["total_us"] / 1000:8.1f} ms')
+            for name, self_us, _ in top:
+                print(f'    {self_us / 1000:8.1f} ms  {name.strip()}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())